@@ -1,98 +1,116 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-import seaborn as sns
-import matplotlib.pyplot as plt
 import numpy as np
 
-def main():
-    st.title("🔍 Analyze")
-    st.write("Explore data analysis and statistical summaries here.")
-
-    # Load dataset
-    @st.cache_data
-    def load_data():
-        try:
-            return pd.read_csv("star_classification.csv")
-        except Exception as e:
-            st.error(f"Error loading data: {e}")
-            return pd.DataFrame()  # Return empty DataFrame in case of error
-
-    data = load_data()
+import data_loader
+import density
+import downsample
+import instrumentation
+import stats
+import trendline
 
-    if data.empty:
-        st.stop()
+# Fragments rerun on their own when one of their widgets changes, so a
+# section's inputs only cost that section's work. Older Streamlit releases
+# without fragments simply rerun the whole page.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
 
-    # Data Analysis & Statistics
 
-    # Descriptive Statistics
+@fragment
+@instrumentation.timed()
+def descriptive_statistics(data):
     st.subheader("📊 Descriptive Statistics")
     st.write("Basic statistical summary of the dataset.")
-    st.write(data.describe())
+    st.write(stats.describe())
+
 
-    # Correlation Matrix
+@fragment
+@instrumentation.timed()
+def correlation_matrix(data):
     st.subheader("🌡️ Correlation Matrix")
     columns_corr = st.multiselect("Choose columns for correlation matrix:", data.columns.tolist(), default=["alpha", "delta", "u", "g", "r", "i", "z", "redshift"])
     if len(columns_corr) > 1:
-        correlation_matrix = data[columns_corr].corr()
+        correlation_matrix = stats.correlation(columns_corr)
         heatmap_fig = px.imshow(correlation_matrix, text_auto=True, title="Correlation Matrix")
-        st.plotly_chart(heatmap_fig)
+        instrumentation.plotly_chart(heatmap_fig)
     else:
         st.warning("Select at least two columns for correlation matrix.")
 
-    # Skewness and Kurtosis
+
+@fragment
+@instrumentation.timed()
+def skewness_and_kurtosis(data):
     st.subheader("📉 Skewness and Kurtosis")
     columns_skew_kurt = st.multiselect("Choose columns for skewness and kurtosis:", data.columns.tolist(), default=["alpha", "delta", "u"])
     if len(columns_skew_kurt) > 0:
-        st.write("Skewness:", data[columns_skew_kurt].skew())
-        st.write("Kurtosis:", data[columns_skew_kurt].kurtosis())
+        st.write("Skewness:", stats.skewness(columns_skew_kurt))
+        st.write("Kurtosis:", stats.kurtosis(columns_skew_kurt))
+
 
-    # Histograms
+@fragment
+@instrumentation.timed()
+def histograms(data):
     st.subheader("🖼️ Histograms")
     column_histogram = st.selectbox("Choose column for histogram:", data.columns.tolist())
+    class_histogram = st.selectbox("Filter histogram by class:", stats.class_options(), key="histogram_class")
     if column_histogram:
-        histogram_fig = px.histogram(data, x=column_histogram, nbins=20, title=f"Histogram of {column_histogram}")
-        st.plotly_chart(histogram_fig)
+        histogram_fig = stats.histogram_figure(column_histogram, nbins=20, class_value=class_histogram)
+        instrumentation.plotly_chart(histogram_fig)
 
-    # Box Plot
+
+@fragment
+@instrumentation.timed()
+def box_plot(data):
     st.subheader("📊 Box Plot")
     column_box = st.selectbox("Choose column for box plot:", data.columns.tolist())
     if column_box:
         box_plot = px.box(data, y=column_box, title=f"Box Plot of {column_box}")
-        st.plotly_chart(box_plot)
+        instrumentation.plotly_chart(box_plot)
+
 
-    # Violin Plot
+@fragment
+@instrumentation.timed()
+def violin_plot(data):
     st.subheader("🎻 Violin Plot")
-    column_violin = st.selectbox("Choose column for violin plot:", data.columns.tolist())
+    column_violin = st.selectbox("Choose column for violin plot:", data.select_dtypes("number").columns.tolist())
     if column_violin:
-        violin_plot = sns.violinplot(data[column_violin])
-        st.pyplot(violin_plot.figure)
-        plt.close()
+        instrumentation.plotly_chart(density.violin_figure(column_violin))
+
 
-    # Correlation Heatmap
+@fragment
+@instrumentation.timed()
+def correlation_heatmap(data):
     st.subheader("🌡️ Correlation Heatmap")
     columns_heatmap = st.multiselect("Choose columns for correlation heatmap:", data.columns.tolist(), default=["alpha", "delta", "u", "g", "r", "i", "z", "redshift"])
     if len(columns_heatmap) > 1:
-        correlation_matrix = data[columns_heatmap].corr()
+        correlation_matrix = stats.correlation(columns_heatmap)
         heatmap_fig = px.imshow(correlation_matrix, text_auto=True, title="Feature Correlation Heatmap")
-        st.plotly_chart(heatmap_fig)
+        instrumentation.plotly_chart(heatmap_fig)
     else:
         st.warning("Select at least two columns for correlation heatmap.")
 
-    # Pie Chart of Star Types
+
+@fragment
+@instrumentation.timed()
+def star_type_distribution(data):
     st.subheader("🥧 Star Type Distribution")
     star_type_dist = data["class"].value_counts()
     pie_chart_fig = px.pie(values=star_type_dist.values, names=star_type_dist.index, title="Star Type Distribution")
-    st.plotly_chart(pie_chart_fig)
+    instrumentation.plotly_chart(pie_chart_fig)
+
 
-    # Line Chart
+@fragment
+@instrumentation.timed()
+def line_chart(data):
     st.subheader("📈 Line Chart")
     columns_line = st.multiselect("Choose columns for line plot:", data.columns.tolist(), default=["alpha", "delta"])
     if len(columns_line) > 0:
-        line_chart_fig = px.line(data, y=columns_line, title="Line Plot of Selected Columns")
-        st.plotly_chart(line_chart_fig)
+        line_chart_fig = px.line(downsample.line_points(columns_line), y=columns_line, title="Line Plot of Selected Columns")
+        instrumentation.plotly_chart(line_chart_fig)
 
-    # Area Chart of Star Counts by `redshift`
+
+@fragment
+@instrumentation.timed()
+def redshift_area_chart(data):
     st.subheader("📊 Area Chart of Star Counts by Redshift")
     redshift_counts = data["redshift"].value_counts().reset_index()
     redshift_counts.columns = ["redshift", "count"]  # Rename columns to match what Plotly expects
@@ -103,67 +121,90 @@ def main():
         title="Star Counts by Redshift",
         labels={"redshift": "Redshift", "count": "Star Counts"}
     )
-    st.plotly_chart(area_chart_fig)
+    instrumentation.plotly_chart(area_chart_fig)
+
 
-    # Scatter Plot
+@fragment
+@instrumentation.timed()
+def scatter_plot(data):
     st.subheader("🔍 Scatter Plot")
     x_axis = st.selectbox("Choose column for X axis:", data.columns.tolist())
     y_axis = st.selectbox("Choose column for Y axis:", data.columns.tolist())
+    scatter_mode = st.radio("Render scatter plot as:", ["Sampled points", "Density"], horizontal=True)
     if x_axis and y_axis:
-        scatter_fig = px.scatter(data, x=x_axis, y=y_axis, title=f"Scatter Plot of {x_axis} vs {y_axis}")
-        st.plotly_chart(scatter_fig)
+        title = f"Scatter Plot of {x_axis} vs {y_axis}"
+        if scatter_mode == "Density":
+            scatter_fig = downsample.density_figure(x_axis, y_axis, title)
+        else:
+            scatter_fig = px.scatter(downsample.sample_points([x_axis, y_axis]), x=x_axis, y=y_axis, title=title)
+        instrumentation.plotly_chart(scatter_fig)
+
 
-    # Heatmap
+@fragment
+@instrumentation.timed()
+def heatmap_of_values(data):
     st.subheader("🌡️ Heatmap of Values")
     columns_heatmap_values = st.multiselect("Choose columns for heatmap:", data.columns.tolist(), default=["alpha", "delta", "u"])
     if len(columns_heatmap_values) > 1:
-        heatmap_matrix = data[columns_heatmap_values].corr()
+        heatmap_matrix = stats.correlation(columns_heatmap_values)
         heatmap_fig = px.imshow(heatmap_matrix, text_auto=True, title="Heatmap of Values")
-        st.plotly_chart(heatmap_fig)
+        instrumentation.plotly_chart(heatmap_fig)
     else:
         st.warning("Select at least two columns for heatmap.")
 
-    # KDE Plot
+
+@fragment
+@instrumentation.timed()
+def kde_plot(data):
     st.subheader("🌈 KDE Plot")
-    column_kde = st.selectbox("Choose column for KDE plot:", data.columns.tolist())
+    column_kde = st.selectbox("Choose column for KDE plot:", data.select_dtypes("number").columns.tolist())
+    bw_adjust = st.slider("Bandwidth adjustment:", 0.2, 3.0, 1.0, 0.1)
     if column_kde:
-        kde_plot = sns.kdeplot(data[column_kde], fill=True)
-        st.pyplot(kde_plot.figure)
-        plt.close()
+        instrumentation.plotly_chart(density.kde_figure([column_kde], title=f"KDE of {column_kde}", fill=True, bw_adjust=bw_adjust))
+
 
-    # Density Plot
+@fragment
+@instrumentation.timed()
+def density_plot(data):
     st.subheader("🔍 Density Plot")
-    columns_density = st.multiselect("Choose columns for density plot:", data.columns.tolist(), default=["alpha", "delta"])
+    columns_density = st.multiselect("Choose columns for density plot:", data.select_dtypes("number").columns.tolist(), default=["alpha", "delta"])
     if len(columns_density) > 0:
-        density_plot = sns.kdeplot(data[columns_density])
-        st.pyplot(density_plot.figure)
-        plt.close()
+        instrumentation.plotly_chart(density.kde_figure(columns_density, title="Density Plot of Selected Columns"))
 
-    # Box Plot for Multiple Columns
+
+@fragment
+@instrumentation.timed()
+def box_plot_multiple(data):
     st.subheader("📦 Box Plot for Multiple Columns")
     columns_box_multiple = st.multiselect("Choose columns for box plot:", data.columns.tolist(), default=["alpha", "delta"])
     if len(columns_box_multiple) > 0:
         box_plot_multiple_fig = px.box(data, y=columns_box_multiple, title="Box Plot of Selected Columns")
-        st.plotly_chart(box_plot_multiple_fig)
+        instrumentation.plotly_chart(box_plot_multiple_fig)
+
 
-    # Histogram for Multiple Columns
+@fragment
+@instrumentation.timed()
+def histogram_multiple(data):
     st.subheader("📊 Histogram for Multiple Columns")
     columns_histogram_multiple = st.multiselect("Choose columns for histogram:", data.columns.tolist(), default=["alpha", "delta"])
     if len(columns_histogram_multiple) > 0:
-        histogram_multiple_fig = px.histogram(data, y=columns_histogram_multiple, nbins=20, title="Histogram of Selected Columns")
-        st.plotly_chart(histogram_multiple_fig)
+        histogram_multiple_fig = stats.multi_histogram_figure(columns_histogram_multiple, nbins=20, title="Histogram of Selected Columns")
+        instrumentation.plotly_chart(histogram_multiple_fig)
+
 
-    # Violin Plot for Multiple Columns
+@fragment
+@instrumentation.timed()
+def violin_plot_multiple(data):
     st.subheader("🎻 Violin Plot for Multiple Columns")
-    columns_violin_multiple = st.multiselect("Choose columns for violin plot:", data.columns.tolist(), default=["alpha", "delta"])
+    columns_violin_multiple = st.multiselect("Choose columns for violin plot:", data.select_dtypes("number").columns.tolist(), default=["alpha", "delta"])
     if len(columns_violin_multiple) > 0:
         for col in columns_violin_multiple:
-            violin_plot = sns.violinplot(data[col])
-            st.pyplot(violin_plot.figure)
-            plt.close()
+            instrumentation.plotly_chart(density.violin_figure(col))
 
-    # Bubble Chart
-    # Bubble Chart
+
+@fragment
+@instrumentation.timed()
+def bubble_chart(data):
     st.subheader("🌐 Bubble Chart")
     st.write("Visualize relationships with a bubble chart.")
     x_bubble = st.selectbox("Choose column for X axis:", data.columns.tolist(), index=0, key="bubble_x")
@@ -171,22 +212,70 @@ def main():
     size_bubble = st.selectbox("Choose column for bubble size:", data.columns.tolist(), index=2, key="bubble_size")
 
     if x_bubble and y_bubble and size_bubble:
-    # Ensure all bubble sizes are positive and scaled appropriately
-      bubble_size = data[size_bubble].abs() + 1e-10  # Add a small constant to avoid zero size
-      bubble_chart_fig = px.scatter(
-        data, x=x_bubble, y=y_bubble, size=bubble_size, color=size_bubble,
-        title=f"Bubble Chart of {x_bubble} vs {y_bubble} with size based on {size_bubble}"
-      )
-    st.plotly_chart(bubble_chart_fig)
-
-    # Regression Line
+        # Ensure all bubble sizes are positive and scaled appropriately
+        bubble_data = downsample.sample_points([x_bubble, y_bubble, size_bubble])
+        bubble_size = bubble_data[size_bubble].abs() + 1e-10  # Add a small constant to avoid zero size
+        bubble_chart_fig = px.scatter(
+            bubble_data, x=x_bubble, y=y_bubble, size=bubble_size, color=size_bubble,
+            title=f"Bubble Chart of {x_bubble} vs {y_bubble} with size based on {size_bubble}"
+        )
+        instrumentation.plotly_chart(bubble_chart_fig)
+
+
+@fragment
+@instrumentation.timed()
+def regression_line(data):
     st.subheader("📏 Regression Line")
     st.write("Add a regression line to the scatter plot.")
     x_reg = st.selectbox("Choose column for X axis (Regression):", data.columns.tolist(), index=0, key="reg_x")
     y_reg = st.selectbox("Choose column for Y axis (Regression):", data.columns.tolist(), index=1, key="reg_y")
     if x_reg and y_reg:
-        reg_fig = px.scatter(data, x=x_reg, y=y_reg, trendline="ols", title=f"Regression Line of {x_reg} vs {y_reg}")
-        st.plotly_chart(reg_fig)
+        reg_fig = trendline.trendline_figure(x_reg, y_reg, title=f"Regression Line of {x_reg} vs {y_reg}")
+        instrumentation.plotly_chart(reg_fig)
+
+
+# Page sections in display order
+SECTIONS = {
+    "📊 Descriptive Statistics": descriptive_statistics,
+    "🌡️ Correlation Matrix": correlation_matrix,
+    "📉 Skewness and Kurtosis": skewness_and_kurtosis,
+    "🖼️ Histograms": histograms,
+    "📊 Box Plot": box_plot,
+    "🎻 Violin Plot": violin_plot,
+    "🌡️ Correlation Heatmap": correlation_heatmap,
+    "🥧 Star Type Distribution": star_type_distribution,
+    "📈 Line Chart": line_chart,
+    "📊 Area Chart of Star Counts by Redshift": redshift_area_chart,
+    "🔍 Scatter Plot": scatter_plot,
+    "🌡️ Heatmap of Values": heatmap_of_values,
+    "🌈 KDE Plot": kde_plot,
+    "🔍 Density Plot": density_plot,
+    "📦 Box Plot for Multiple Columns": box_plot_multiple,
+    "📊 Histogram for Multiple Columns": histogram_multiple,
+    "🎻 Violin Plot for Multiple Columns": violin_plot_multiple,
+    "🌐 Bubble Chart": bubble_chart,
+    "📏 Regression Line": regression_line
+}
+
+DEFAULT_SECTIONS = ["📊 Descriptive Statistics", "🌡️ Correlation Matrix", "🖼️ Histograms"]
+
+
+def main():
+    st.title("🔍 Analyze")
+    st.write("Explore data analysis and statistical summaries here.")
+
+    # Load dataset (shared across pages and sessions, see data_loader)
+    data = data_loader.load_data()
+
+    if data.empty:
+        st.stop()
+
+    # Only the chosen sections are computed; each one reruns on its own
+    selected_sections = st.multiselect("Choose sections to display:", list(SECTIONS), default=DEFAULT_SECTIONS)
+
+    for name, section in SECTIONS.items():
+        if name in selected_sections:
+            section(data)
 
 if __name__ == "__main__":
     main()
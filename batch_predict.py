@@ -0,0 +1,103 @@
+"""Chunked batch scoring of SDSS exports with the star classification model.
+
+Usage:
+    python batch_predict.py input.csv output.csv [--chunksize 100000] [--threshold 0.9] [--margin 0.2]
+"""
+import argparse
+import time
+
+import pandas as pd
+
+import inference
+import instrumentation
+import model_registry
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Identifier columns copied through to the output when present in the input
+PASSTHROUGH_COLUMNS = ['obj_ID', 'spec_obj_ID']
+
+
+def score_frame(model, features, threshold=None, margin=None):
+    """Classify a DataFrame of model features with a single predict_proba call.
+
+    Besides the predicted class and per-class probabilities, each row gets
+    its ``confidence`` and a ``follow_up`` flag set where the threshold/margin
+    rule abstains (see inference.decide).
+    """
+    with instrumentation.section(f"batch inference ({len(features):,} rows)"):
+        probabilities = model.predict_proba(features[model_registry.FEATURE_COLUMNS])
+    labels, confidence, abstain = inference.decide(probabilities, model.classes_, threshold, margin)
+    result = pd.DataFrame(
+        probabilities,
+        columns=[f"prob_{label}" for label in model.classes_],
+        index=features.index
+    )
+    result.insert(0, "class", labels)
+    result.insert(1, "confidence", confidence)
+    result.insert(2, "follow_up", abstain)
+    return result
+
+
+def score_chunks(source, model=None, chunksize=DEFAULT_CHUNKSIZE, threshold=None, margin=None):
+    """Yield scored DataFrames for ``source`` (path or file object), one per chunk.
+
+    Only the model columns plus known identifier columns are parsed, so memory
+    use is bounded by ``chunksize`` regardless of the input size.
+    """
+    if model is None:
+        model = model_registry.get_model()
+    wanted = set(model_registry.FEATURE_COLUMNS) | set(PASSTHROUGH_COLUMNS)
+    reader = pd.read_csv(source, usecols=lambda column: column in wanted, chunksize=chunksize)
+    for chunk in reader:
+        missing = [column for column in model_registry.FEATURE_COLUMNS if column not in chunk.columns]
+        if missing:
+            raise ValueError(f"Input is missing model columns: {', '.join(missing)}")
+        ids = [column for column in PASSTHROUGH_COLUMNS if column in chunk.columns]
+        scored = score_frame(model, chunk, threshold, margin)
+        yield pd.concat([chunk[ids + model_registry.FEATURE_COLUMNS], scored], axis=1)
+
+
+def score_csv(source, destination, model=None, chunksize=DEFAULT_CHUNKSIZE, progress=None, threshold=None, margin=None):
+    """Stream scored rows from ``source`` into the CSV ``destination``.
+
+    ``progress`` is called with the running row count after each chunk.
+    Returns the number of rows, the number flagged for follow-up, elapsed
+    seconds and rows per second.
+    """
+    rows = 0
+    follow_up = 0
+    start = time.perf_counter()
+    chunks = score_chunks(source, model=model, chunksize=chunksize, threshold=threshold, margin=margin)
+    for index, scored in enumerate(chunks):
+        scored.to_csv(destination, header=index == 0, index=False)
+        rows += len(scored)
+        follow_up += int(scored["follow_up"].sum())
+        if progress is not None:
+            progress(rows)
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "follow_up": follow_up,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds > 0 else float("nan")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify an SDSS CSV export in fixed-size chunks.")
+    parser.add_argument("input", help="CSV with alpha, delta, u, g, r, i, z, redshift, plate and MJD columns")
+    parser.add_argument("output", help="Destination CSV for the scored rows")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows scored per model call")
+    parser.add_argument("--threshold", type=float, help="Flag rows whose top class probability is below this")
+    parser.add_argument("--margin", type=float, help="Flag rows whose top two class probabilities differ by less than this")
+    args = parser.parse_args()
+
+    with open(args.output, "w", newline="") as destination:
+        stats = score_csv(args.input, destination, chunksize=args.chunksize, threshold=args.threshold, margin=args.margin)
+    print(f"Scored {stats['rows']} rows in {stats['seconds']:.2f}s ({stats['rows_per_second']:,.0f} rows/s), "
+          f"{stats['follow_up']} flagged for follow-up")
+
+
+if __name__ == "__main__":
+    main()
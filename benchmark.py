@@ -0,0 +1,218 @@
+"""Benchmarks of every page's hot path on synthetic SDSS-shaped data.
+
+Usage:
+    python benchmark.py [--rows 10000 100000 1000000] [--repeat 5] [--output benchmark.json]
+
+For each dataset size, a synthetic star_classification.csv is written to a
+temporary directory and the suite runs in a fresh interpreter there, so
+every size starts with cold caches. The suite times data loading (CSV to
+columnar cache, then memory-mapped reads), single-row and batch prediction,
+neighbour index builds and top-k queries, the correlation and summary
+statistics, KDE, and the JSON size and serialization time of the figures
+the pages send to the browser. Results are written as JSON with sorted keys
+so runs from two commits can be diffed directly.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+DEFAULT_REPEAT = 5
+DEFAULT_OUTPUT = "benchmark.json"
+
+# Single-row predictions and neighbour queries timed per size
+LATENCY_SAMPLES = 200
+TOP_K = 10
+
+
+def measure(func, repeat):
+    """Time ``repeat`` calls of ``func``; returns (timings, result of the last call)."""
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        seconds.append(time.perf_counter() - start)
+    return {"min_seconds": min(seconds), "median_seconds": statistics.median(seconds), "repeat": repeat}, result
+
+
+def latencies(func, inputs):
+    """p50/p99 latency of ``func`` over ``inputs``, one call each."""
+    seconds = []
+    for value in inputs:
+        start = time.perf_counter()
+        func(value)
+        seconds.append(time.perf_counter() - start)
+    return {
+        "p50_ms": float(np.percentile(seconds, 50)) * 1000,
+        "p99_ms": float(np.percentile(seconds, 99)) * 1000,
+        "calls": len(seconds)
+    }
+
+
+def figure_size(figure, repeat):
+    """Serialized JSON size of a Plotly figure and the time to serialize it."""
+    timing, payload = measure(figure.to_json, repeat)
+    return dict(timing, bytes=len(payload))
+
+
+def run_suite(repeat=DEFAULT_REPEAT):
+    """Run every benchmark against the dataset in the working directory."""
+    # Imported here so the parent process stays light and each size gets fresh caches
+    import plotly.express as px
+
+    import batch_predict
+    import data_loader
+    import density
+    import downsample
+    import inference
+    import model_registry
+    import neighbors
+    import recommend
+    import stats
+    import trendline
+
+    results = {}
+
+    # Data loading: the first read parses the CSV and builds the columnar cache
+    results["load_data_cold"], _ = measure(data_loader.read_star_data, 1)
+    results["load_data_warm"], data = measure(data_loader.read_star_data, repeat)
+    results["load_data_recommend_columns"], _ = measure(
+        lambda: data_loader.read_star_data(columns=recommend.RECOMMEND_COLUMNS), repeat
+    )
+    results["rows"] = len(data)
+    data = data_loader.load_data()
+
+    # Predict page: single rows through the cache-miss fast path, then cache hits
+    model = model_registry.get_model()
+    features = data[model_registry.FEATURE_COLUMNS]
+    sample = features.sample(min(LATENCY_SAMPLES, len(features)), random_state=0)
+    results["predict_single_row"] = latencies(
+        lambda values: inference._score(model, values), sample.itertuples(index=False)
+    )
+    records = sample.to_dict("records")
+    for record in records:
+        inference.predict_one(record)
+    results["predict_single_row_cached"] = latencies(inference.predict_one, records)
+
+    # Batch classification of the whole dataset
+    timing, _ = measure(lambda: batch_predict.score_frame(model, features), min(repeat, 3))
+    results["predict_batch"] = dict(timing, rows_per_second=len(features) / timing["median_seconds"])
+
+    # Recommend page: index build for the default metric, then top-k queries
+    metric = next(iter(neighbors.METRICS))
+    recommend_data = data_loader.load_data(columns=recommend.RECOMMEND_COLUMNS)
+    results["recommend_build_index"], indexes = measure(
+        lambda: neighbors.build_indexes(recommend_data, metric=metric), min(repeat, 3)
+    )
+    index = max(indexes.values(), key=len)
+    points = recommend_data[neighbors.FEATURE_COLUMNS].sample(min(LATENCY_SAMPLES, len(recommend_data)), random_state=1)
+    results["recommend_top_k"] = latencies(
+        lambda point: index.query(np.asarray(point, dtype=np.float64), k=TOP_K), points.itertuples(index=False)
+    )
+
+    # Analyze page: correlation matrix and summary statistics, computed from scratch each time
+    def uncached(function):
+        def call():
+            function.clear()
+            return function()
+        return call
+
+    results["analyze_correlation"], correlation = measure(uncached(stats.correlation_matrix), repeat)
+    results["analyze_describe"], _ = measure(uncached(stats.summary), repeat)
+
+    # KDE of one column on the default grid
+    redshift = data["redshift"].to_numpy(dtype=np.float64)
+    results["kde"], _ = measure(lambda: density.binned_kde(redshift), repeat)
+
+    # Payload of the figures the pages render
+    results["figure_bytes"] = {
+        "histogram": figure_size(stats.histogram_figure("u"), repeat),
+        "correlation_heatmap": figure_size(px.imshow(correlation, text_auto=True), repeat),
+        "scatter_sampled": figure_size(px.scatter(downsample.sample_points(["u", "g"]), x="u", y="g"), repeat),
+        "scatter_density": figure_size(downsample.density_figure("u", "g", "Density"), repeat),
+        "trendline": figure_size(trendline.trendline_figure("u", "g", "Trendline"), repeat),
+        "kde": figure_size(density.kde_figure(["u", "g", "r"]), repeat),
+        "violin": figure_size(density.violin_figure("redshift"), repeat)
+    }
+    return results
+
+
+def environment():
+    """Versions and commit the results were produced with."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__
+    }
+
+
+def run_size(rows, repeat=DEFAULT_REPEAT, seed=0):
+    """Generate ``rows`` synthetic objects and run the suite on them in a fresh interpreter."""
+    import model_registry
+    import star_schema
+    import synthetic_data
+
+    repo = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as workdir:
+        synthetic_data.write_csv(os.path.join(workdir, star_schema.DATA_PATH), rows, seed)
+        env = dict(
+            os.environ,
+            PYTHONPATH=os.pathsep.join(filter(None, [repo, os.environ.get("PYTHONPATH")])),
+            STAR_MODEL_PATH=os.path.abspath(model_registry.MODEL_PATH)
+        )
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", "--repeat", str(repeat)],
+            cwd=workdir, env=env, capture_output=True, text=True
+        )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "benchmark failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the app's hot paths on synthetic data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="Dataset sizes to benchmark")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Repetitions per timed call")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Destination JSON file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_suite(args.repeat)))
+        return
+
+    report = {"environment": environment(), "results": {}}
+    for rows in args.rows:
+        print(f"Benchmarking {rows:,} rows...", flush=True)
+        results = report["results"][str(rows)] = run_size(rows, args.repeat)
+        for name, timing in results.items():
+            if isinstance(timing, dict) and "median_seconds" in timing:
+                print(f"    {name:<28} {timing['median_seconds'] * 1000:10.2f} ms")
+            elif isinstance(timing, dict) and "p50_ms" in timing:
+                print(f"    {name:<28} {timing['p50_ms']:10.3f} ms p50, {timing['p99_ms']:.3f} ms p99")
+        for name, figure in results["figure_bytes"].items():
+            print(f"    figure {name:<21} {figure['bytes'] / 1024:10.1f} KiB")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import streamlit as st
+import pandas as pd
+
+import instrumentation
+from star_schema import DATA_PATH, DTYPES
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # Columnar cache is optional; fall back to parsing the CSV
+    feather = None
+
+CACHE_DIR = ".cache"
+
+
+def _file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_paths(path, cache_dir):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"{name}.feather"), os.path.join(cache_dir, f"{name}.json")
+
+
+def _write_atomic(target, write):
+    directory = os.path.dirname(target)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _write_json(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def ensure_columnar_cache(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Return the path of an up-to-date Feather copy of ``path``, building it if needed.
+
+    The cache is reused while the source's mtime and size are unchanged. When
+    they differ the source is hashed, and the cache is only rebuilt if the
+    content actually changed. An unreadable or corrupt meta file is treated
+    as missing and rewritten. Returns None when pyarrow is unavailable.
+    """
+    if feather is None:
+        return None
+    cache_path, meta_path = _cache_paths(path, cache_dir)
+    stat = os.stat(path)
+    signature = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    meta = {}
+    if os.path.exists(cache_path) and os.path.exists(meta_path):
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        if not isinstance(meta, dict):
+            meta = {}
+        if all(meta.get(key) == value for key, value in signature.items()):
+            return cache_path
+
+    digest = _file_hash(path)
+    if meta.get("sha256") != digest or not os.path.exists(cache_path):
+        os.makedirs(cache_dir, exist_ok=True)
+        frame = pd.read_csv(path, dtype=DTYPES)
+        # Uncompressed Feather can be memory-mapped instead of decoded
+        _write_atomic(cache_path, lambda tmp: feather.write_feather(frame, tmp, compression="uncompressed"))
+
+    signature["sha256"] = digest
+    _write_atomic(meta_path, lambda tmp: _write_json(tmp, signature))
+    return cache_path
+
+
+def read_star_data(path=DATA_PATH, columns=None, cache_dir=CACHE_DIR):
+    """Read the star classification data with compact dtypes, optionally only ``columns``.
+
+    Reads from the memory-mapped columnar cache when pyarrow is installed and
+    the cache can be built and read, and parses the CSV otherwise (read-only
+    filesystem, corrupt cache files).
+    """
+    columns = list(columns) if columns is not None else None
+    try:
+        cache_path = ensure_columnar_cache(path, cache_dir)
+        if cache_path is not None:
+            return feather.read_table(cache_path, columns=columns, memory_map=True).to_pandas()
+    except (OSError, ValueError):
+        pass
+    return pd.read_csv(path, usecols=columns, dtype=DTYPES)
+
+
+@st.cache_resource
+def _load_shared(path, columns):
+    return read_star_data(path, columns)
+
+
+def load_data(path=DATA_PATH, columns=None):
+    """Return the dataset, read once per process and shared by every page and session.
+
+    ``columns`` restricts the load to a projection of the file; each distinct
+    projection is cached separately. The same DataFrame object is handed to
+    all callers, so it must be treated as read-only: derive new frames
+    (``assign``, ``copy``) instead of modifying it. Returns an empty DataFrame
+    if the file cannot be read.
+    """
+    try:
+        with instrumentation.section("data load"):
+            return _load_shared(path, tuple(columns) if columns is not None else None)
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        return pd.DataFrame()  # Return empty DataFrame in case of error
@@ -0,0 +1,127 @@
+"""Cached kernel density estimates and the KDE/violin charts drawn from them.
+
+Densities are evaluated on a fixed grid with a binned approximation: the data
+are linearly binned onto the grid once and convolved with the Gaussian kernel
+by FFT, which costs O(rows + grid log grid) instead of O(rows * grid).
+"""
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+import data_loader
+
+GRID_SIZE = 512
+
+# Bandwidths beyond the data range the grid extends to, as in seaborn's kdeplot
+CUT = 3
+
+
+def scott_bandwidth(values):
+    """Scott's rule of thumb, the default bandwidth of seaborn and scipy."""
+    return values.std(ddof=1) * len(values) ** (-1 / 5)
+
+
+def binned_kde(values, bandwidth=None, bw_adjust=1.0, grid_size=GRID_SIZE, cut=CUT):
+    """Gaussian KDE of ``values`` on an evenly spaced grid.
+
+    Returns (grid, density). ``bandwidth`` defaults to Scott's rule and is
+    multiplied by ``bw_adjust``.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    if len(values) < 2:
+        return np.empty(0), np.empty(0)
+    if bandwidth is None:
+        bandwidth = scott_bandwidth(values)
+    bandwidth *= bw_adjust
+    if not bandwidth > 0:
+        # Constant column: fall back to a narrow kernel around the value
+        bandwidth = max(abs(values[0]) * 1e-3, 1e-3)
+
+    low = values.min() - cut * bandwidth
+    high = values.max() + cut * bandwidth
+    grid, step = np.linspace(low, high, grid_size, retstep=True)
+
+    # Linear binning: split each value between its two neighbouring grid points
+    position = (values - low) / step
+    left = np.clip(np.floor(position).astype(np.int64), 0, grid_size - 2)
+    weight_right = position - left
+    counts = np.bincount(left, weights=1 - weight_right, minlength=grid_size)
+    counts += np.bincount(left + 1, weights=weight_right, minlength=grid_size)
+
+    # Gaussian kernel sampled at grid offsets, truncated at 4 bandwidths
+    reach = min(grid_size - 1, int(np.ceil(4 * bandwidth / step)))
+    offsets = np.arange(-reach, reach + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+
+    size = 1 << int(np.ceil(np.log2(grid_size + len(kernel) - 1)))
+    convolved = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel, size), size)
+    density = convolved[reach:reach + grid_size] / len(values)
+    return grid, np.clip(density, 0, None)
+
+
+@st.cache_data(show_spinner=False)
+def kde_curve(column, bw_adjust=1.0, grid_size=GRID_SIZE):
+    """Cached (grid, density) of a dataset column."""
+    values = data_loader.load_data()[column].to_numpy(dtype=np.float64)
+    return binned_kde(values, bw_adjust=bw_adjust, grid_size=grid_size)
+
+
+@st.cache_data(show_spinner=False)
+def quartiles(column):
+    """Cached (q1, median, q3, lower whisker, upper whisker) of a dataset column."""
+    values = data_loader.load_data()[column].to_numpy(dtype=np.float64)
+    values = values[np.isfinite(values)]
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    spread = 1.5 * (q3 - q1)
+    lower = values[values >= q1 - spread].min()
+    upper = values[values <= q3 + spread].max()
+    return q1, median, q3, lower, upper
+
+
+def kde_figure(columns, title="KDE Plot", fill=False, bw_adjust=1.0, colors=None):
+    """Density curves of one or more columns drawn from cached KDEs."""
+    fig = go.Figure()
+    for index, column in enumerate(columns):
+        grid, density = kde_curve(column, bw_adjust)
+        fig.add_trace(go.Scatter(
+            x=grid,
+            y=density,
+            mode="lines",
+            name=column,
+            fill="tozeroy" if fill else None,
+            line={"color": colors[index % len(colors)]} if colors else None
+        ))
+    fig.update_layout(title=title, xaxis_title="Value", yaxis_title="Density", showlegend=len(columns) > 1)
+    return fig
+
+
+def violin_figure(column, title=None, color="#4c72b0"):
+    """Violin plot of a column: the mirrored cached KDE plus a quartile box."""
+    grid, density = kde_curve(column)
+    q1, median, q3, lower, upper = quartiles(column)
+    half_width = 0.4 * density / density.max() if len(density) and density.max() > 0 else density
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=np.concatenate([-half_width, half_width[::-1]]),
+        y=np.concatenate([grid, grid[::-1]]),
+        fill="toself",
+        mode="lines",
+        line={"color": color},
+        name=column,
+        hoverinfo="y"
+    ))
+    fig.add_trace(go.Scatter(x=[0, 0], y=[lower, upper], mode="lines", line={"color": "#333", "width": 1.5},
+                             hoverinfo="skip"))
+    fig.add_trace(go.Scatter(x=[0, 0], y=[q1, q3], mode="lines", line={"color": "#333", "width": 6},
+                             hoverinfo="skip"))
+    fig.add_trace(go.Scatter(x=[0], y=[median], mode="markers", marker={"color": "white", "size": 7},
+                             hovertext=f"median {median:.4g}", hoverinfo="text"))
+    fig.update_layout(
+        title=title or f"Violin Plot of {column}",
+        yaxis_title=column,
+        xaxis={"visible": False, "range": [-0.5, 0.5]},
+        showlegend=False
+    )
+    return fig
@@ -0,0 +1,135 @@
+"""Server-side decimation so charts ship a bounded number of points to the browser.
+
+The cached helpers read the shared dataset from data_loader themselves, so
+their cache key is just the requested columns and point budget.
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+import data_loader
+
+# Default number of points sent to the browser per chart
+SCATTER_BUDGET = 5000
+LINE_BUDGET = 2000
+DENSITY_BINS = 200
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets decimation; returns the indices to keep.
+
+    Keeps the first and last points and, for every bucket in between, the
+    point forming the largest triangle with the previously kept point and the
+    mean of the next bucket. This preserves peaks that uniform sampling drops.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = end, edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end].mean()
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.nanargmax(areas)) if np.isfinite(areas).any() else start
+        selected[bucket + 1] = previous
+    return selected
+
+
+def stratified_indices(labels, budget, seed=0):
+    """Pick about ``budget`` row positions, sampling each label in proportion to its size.
+
+    Every label keeps at least one row so rare classes stay visible. The
+    result is sorted and deterministic for a given ``seed``.
+    """
+    labels = pd.Series(labels).reset_index(drop=True)
+    if len(labels) <= budget:
+        return np.arange(len(labels))
+    rng = np.random.default_rng(seed)
+    picked = []
+    for _, positions in labels.groupby(labels, observed=True).indices.items():
+        share = max(1, int(round(budget * len(positions) / len(labels))))
+        picked.append(rng.choice(positions, size=min(share, len(positions)), replace=False))
+    return np.sort(np.concatenate(picked))
+
+
+@st.cache_data(show_spinner=False)
+def sample_points(columns, budget=SCATTER_BUDGET, class_column="class"):
+    """Stratified-by-class sample of ``columns`` for scatter and bubble charts."""
+    data = data_loader.load_data()
+    columns = list(dict.fromkeys(columns))
+    labels = data[class_column] if class_column in data.columns else pd.Series(np.zeros(len(data)))
+    return data[columns].iloc[stratified_indices(labels, budget)]
+
+
+def _numeric(data, column):
+    return pd.api.types.is_numeric_dtype(data[column])
+
+
+@st.cache_data(show_spinner=False)
+def line_points(columns, budget=LINE_BUDGET, class_column="class"):
+    """Rows of ``columns`` kept by LTTB over the row index, for line charts.
+
+    Each column gets an equal share of the budget and the union of the kept
+    rows is returned, so every series keeps its own extremes. Non-numeric
+    columns such as "class" have no extremes to keep; their share is a
+    stratified row sample as in sample_points.
+    """
+    data = data_loader.load_data()
+    columns = list(dict.fromkeys(columns))
+    share = max(3, budget // max(len(columns), 1))
+    x = np.arange(len(data))
+    keep = [
+        lttb(x, data[column].to_numpy(dtype=np.float64), share)
+        for column in columns if _numeric(data, column)
+    ]
+    if len(keep) < len(columns):
+        labels = data[class_column] if class_column in data.columns else pd.Series(np.zeros(len(data)))
+        keep.append(stratified_indices(labels, share * (len(columns) - len(keep))))
+    return data[columns].iloc[np.unique(np.concatenate(keep))]
+
+
+@st.cache_data(show_spinner=False)
+def density_grid(x_column, y_column, bins=DENSITY_BINS):
+    """2-D histogram of two numeric columns as (counts, x centers, y centers)."""
+    data = data_loader.load_data()
+    x = data[x_column].to_numpy(dtype=np.float64)
+    y = data[y_column].to_numpy(dtype=np.float64)
+    finite = np.isfinite(x) & np.isfinite(y)
+    counts, x_edges, y_edges = np.histogram2d(x[finite], y[finite], bins=bins)
+    return counts.T, (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2
+
+
+def density_figure(x_column, y_column, title, bins=DENSITY_BINS):
+    """Plotly heatmap of point density; its size depends on ``bins``, not on the row count.
+
+    A density grid needs two numeric axes, so a non-numeric column falls back
+    to a scatter of the stratified sample.
+    """
+    data = data_loader.load_data()
+    if not (_numeric(data, x_column) and _numeric(data, y_column)):
+        return px.scatter(sample_points([x_column, y_column]), x=x_column, y=y_column, title=title)
+    counts, x_centers, y_centers = density_grid(x_column, y_column, bins)
+    fig = px.imshow(
+        np.log1p(counts),
+        x=x_centers,
+        y=y_centers,
+        origin="lower",
+        aspect="auto",
+        color_continuous_scale="Viridis",
+        labels={"x": x_column, "y": y_column, "color": "log(1 + count)"},
+        title=title
+    )
+    return fig
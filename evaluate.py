@@ -0,0 +1,202 @@
+"""Offline evaluation of the star classification model on a sample of the dataset.
+
+Usage:
+    python evaluate.py [--sample-size 0.2] [--seed 42] [--batch-size 100000]
+
+Scores a stratified random sample of the dataset in batches and writes the
+accuracy, per-class precision/recall/F1, confusion matrix, one-vs-rest ROC
+and precision-recall curves and CatBoost feature importances to a JSON file.
+The Insights page reads that file instead of running inference on each visit.
+
+The rows the shipped model was trained on are not recorded, so the sample
+almost certainly overlaps its training data and the scores are optimistic;
+they are not a held-out estimate of accuracy on unseen objects.
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+import data_loader
+import model_registry
+
+EVALUATION_PATH = os.path.join(data_loader.CACHE_DIR, "evaluation.json")
+DEFAULT_SAMPLE_SIZE = 0.2
+DEFAULT_SEED = 42
+DEFAULT_BATCH_SIZE = 100_000
+
+# Points kept per stored ROC/PR curve; enough for a smooth plot
+CURVE_POINTS = 200
+
+# numpy 2 renamed trapz to trapezoid
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return {"path": path, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def sample_indices(labels, sample_size=DEFAULT_SAMPLE_SIZE, seed=DEFAULT_SEED):
+    """Sorted row positions of a stratified random ``sample_size`` fraction of ``labels``."""
+    labels = np.asarray(labels)
+    rng = np.random.default_rng(seed)
+    selected = []
+    for label in np.unique(labels):
+        members = np.flatnonzero(labels == label)
+        count = max(1, int(round(len(members) * sample_size)))
+        selected.append(rng.choice(members, size=count, replace=False))
+    return np.sort(np.concatenate(selected))
+
+
+def predict_batches(model, features, batch_size=DEFAULT_BATCH_SIZE):
+    """Class probabilities for a 2D float array, one predict_proba call per batch."""
+    return np.concatenate([
+        model.predict_proba(features[start:start + batch_size])
+        for start in range(0, len(features), batch_size)
+    ])
+
+
+def _thin(*arrays, points=CURVE_POINTS):
+    keep = np.unique(np.linspace(0, len(arrays[0]) - 1, min(points, len(arrays[0]))).round().astype(int))
+    return [array[keep].tolist() for array in arrays]
+
+
+def binary_curves(is_positive, scores):
+    """One-vs-rest ROC and precision-recall curves with their areas.
+
+    Returns (fpr, tpr, roc_auc, recall, precision, average_precision), with the
+    curves thinned to CURVE_POINTS points.
+    """
+    order = np.argsort(-scores, kind="mergesort")
+    scores = scores[order]
+    is_positive = is_positive[order]
+    # Last position of each distinct score, so ties form a single threshold
+    cut = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+    true_positives = np.cumsum(is_positive)[cut]
+    false_positives = (cut + 1) - true_positives
+    positives, negatives = true_positives[-1], false_positives[-1]
+
+    tpr = np.r_[0.0, true_positives / max(positives, 1)]
+    fpr = np.r_[0.0, false_positives / max(negatives, 1)]
+    precision = true_positives / (true_positives + false_positives)
+    recall = true_positives / max(positives, 1)
+    roc_auc = float(_trapezoid(tpr, fpr))
+    average_precision = float(np.sum(np.diff(np.r_[0.0, recall]) * precision))
+
+    fpr, tpr = _thin(fpr, tpr)
+    recall, precision = _thin(np.r_[0.0, recall], np.r_[1.0, precision])
+    return fpr, tpr, roc_auc, recall, precision, average_precision
+
+
+def evaluate(model, features, labels, batch_size=DEFAULT_BATCH_SIZE):
+    """Evaluation results for ``features`` (2D array in model column order) against ``labels``."""
+    classes = [str(label) for label in model.classes_]
+    start = time.perf_counter()
+    probabilities = predict_batches(model, features, batch_size)
+    inference_seconds = time.perf_counter() - start
+
+    present, inverse = np.unique(np.asarray(labels).astype(str), return_inverse=True)
+    unknown = sorted(set(present) - set(classes))
+    if unknown:
+        raise ValueError(f"Labels {unknown} are not model classes {classes}")
+    actual = np.array([classes.index(label) for label in present])[inverse]
+    predicted = probabilities.argmax(axis=1)
+
+    confusion = np.bincount(actual * len(classes) + predicted, minlength=len(classes) ** 2).reshape(len(classes), -1)
+    true_positives = np.diag(confusion).astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        precision = np.nan_to_num(true_positives / confusion.sum(axis=0))
+        recall = np.nan_to_num(true_positives / confusion.sum(axis=1))
+        f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+
+    per_class = {}
+    for index, label in enumerate(classes):
+        fpr, tpr, roc_auc, pr_recall, pr_precision, average_precision = binary_curves(
+            actual == index, probabilities[:, index]
+        )
+        per_class[label] = {
+            "precision": float(precision[index]),
+            "recall": float(recall[index]),
+            "f1": float(f1[index]),
+            "support": int(confusion[index].sum()),
+            "roc": {"fpr": fpr, "tpr": tpr, "auc": roc_auc},
+            "pr": {"recall": pr_recall, "precision": pr_precision, "average_precision": average_precision}
+        }
+
+    # Exported backends such as ONNX keep only the trees; take importances from the CatBoost pickle
+    importance_model = model if hasattr(model, "get_feature_importance") else model_registry.get_model(model_registry.PICKLE_PATH)
+    feature_names = list(getattr(importance_model, "feature_names_", None) or model_registry.FEATURE_COLUMNS)
+    return {
+        "classes": classes,
+        "rows": int(len(labels)),
+        "inference_seconds": inference_seconds,
+        "accuracy": float(true_positives.sum() / confusion.sum()),
+        "macro": {
+            "precision": float(precision.mean()),
+            "recall": float(recall.mean()),
+            "f1": float(f1.mean())
+        },
+        "per_class": per_class,
+        "confusion_matrix": confusion.tolist(),
+        "feature_importance": dict(zip(feature_names, map(float, importance_model.get_feature_importance())))
+    }
+
+
+def run(data_path=data_loader.DATA_PATH, model_path=model_registry.MODEL_PATH, output=EVALUATION_PATH,
+        sample_size=DEFAULT_SAMPLE_SIZE, seed=DEFAULT_SEED, batch_size=DEFAULT_BATCH_SIZE):
+    """Evaluate the model on a stratified sample of ``data_path`` and write the results to ``output``."""
+    data = data_loader.read_star_data(data_path, columns=model_registry.FEATURE_COLUMNS + ["class"])
+    rows = sample_indices(data["class"].to_numpy(), sample_size, seed)
+    features = data[model_registry.FEATURE_COLUMNS].to_numpy(dtype=np.float64)[rows]
+    results = evaluate(model_registry.get_model(model_path), features, data["class"].to_numpy()[rows], batch_size)
+    results["source"] = {
+        "data": _signature(data_path),
+        "model": _signature(model_path),
+        "sample_size": sample_size,
+        "seed": seed,
+        "created_at": time.time()
+    }
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    data_loader._write_atomic(output, lambda tmp: data_loader._write_json(tmp, results))
+    return results
+
+
+def load_results(path=EVALUATION_PATH):
+    """Stored evaluation results, or None if the job has not been run yet."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def is_stale(results, data_path=data_loader.DATA_PATH, model_path=model_registry.MODEL_PATH):
+    """True if the data or model file changed since ``results`` were computed."""
+    try:
+        current = {"data": _signature(data_path), "model": _signature(model_path)}
+    except OSError:
+        return True
+    return any(results["source"][key] != value for key, value in current.items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the model on a sample of the dataset and store the results.")
+    parser.add_argument("--data", default=data_loader.DATA_PATH, help="Star classification CSV")
+    parser.add_argument("--model", default=model_registry.MODEL_PATH, help="Model file (pickle, .cbm or .onnx)")
+    parser.add_argument("--output", default=EVALUATION_PATH, help="Destination JSON file")
+    parser.add_argument("--sample-size", type=float, default=DEFAULT_SAMPLE_SIZE, help="Fraction of each class scored")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the sample")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows scored per model call")
+    args = parser.parse_args()
+
+    results = run(args.data, args.model, args.output, args.sample_size, args.seed, args.batch_size)
+    print(f"Evaluated {results['rows']} rows in {results['inference_seconds']:.2f}s: "
+          f"accuracy {results['accuracy']:.4f}, macro F1 {results['macro']['f1']:.4f}")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
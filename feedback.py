@@ -1,5 +1,14 @@
 import streamlit as st
 import pandas as pd
+import plotly.express as px
+
+import feedback_store
+import instrumentation
+
+@st.cache_resource
+def get_feedback_store():
+    """Process-wide feedback store whose writer thread is shared by all sessions."""
+    return feedback_store.FeedbackStore()
 
 def main():
     # Set the page layout and background color
@@ -83,8 +92,9 @@ def main():
     # Button to submit the form
     if st.button("Send Feedback"):
         if name and email and feedback and consent:
+            # Queued for the background writer; saving never blocks the page
+            get_feedback_store().submit(name, email, feedback, numeric_rating)
             st.success(f"Thank you, {name}! Your feedback has been received. 🎉")
-            # Simulate saving feedback data
             feedback_data = {
                 "Name": [name],
                 "Email": [email],
@@ -97,6 +107,29 @@ def main():
         else:
             st.error("Please fill out all fields and agree to the terms before submitting. 🚫")
 
+    # Aggregated feedback, read from summary tables maintained by the writer
+    st.markdown("---")
+    st.markdown("<h4 style='color: #4682b4;'>📊 Feedback Summary</h4>", unsafe_allow_html=True)
+    store = get_feedback_store()
+    rating_counts = store.rating_histogram()
+    if rating_counts:
+        with instrumentation.section("chart: ratings"):
+            ratings_fig = px.bar(
+                x=[f"{rating}⭐" for rating in rating_counts],
+                y=list(rating_counts.values()),
+                title="Ratings",
+                labels={"x": "Rating", "y": "Submissions"}
+            )
+            instrumentation.plotly_chart(ratings_fig, use_container_width=True)
+        with instrumentation.section("chart: submissions per day"):
+            daily = pd.DataFrame(store.daily_counts(), columns=["Day", "Submissions", "Average Rating"])
+            daily_fig = px.line(daily, x="Day", y="Submissions", markers=True, title="Submissions per Day")
+            instrumentation.plotly_chart(daily_fig, use_container_width=True)
+    else:
+        st.info("No feedback has been submitted yet.")
+    if store.pending():
+        st.caption(f"{store.pending()} new submission(s) are still being saved.")
+
     # Contact details section
     st.markdown("---")
     st.markdown(
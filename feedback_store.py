@@ -0,0 +1,194 @@
+"""Durable feedback storage in SQLite with a batching background writer.
+
+Submissions are queued in memory and written by a single writer thread, which
+groups everything queued within ``flush_interval`` seconds into one
+transaction. The database runs in WAL mode, so readers never block the
+writer. Summary tables (ratings histogram, submissions per day) are updated in
+the same transaction, so the aggregated view never scans the feedback table.
+
+A batch that fails to write is retried with exponential backoff. After
+``max_attempts`` failures its rows are written one at a time, and rows that
+still fail are moved to the feedback_failed table (or dropped, if even that
+fails) so the writer keeps going. Every failure is logged on the
+``star_app.feedback`` logger.
+"""
+import atexit
+import contextlib
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+FEEDBACK_DB = "feedback.db"
+
+logger = logging.getLogger("star_app.feedback")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY,
+    submitted_at REAL NOT NULL,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    feedback TEXT NOT NULL,
+    rating INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS feedback_rating_counts (
+    rating INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS feedback_daily_counts (
+    day TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    rating_sum INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS feedback_failed (
+    id INTEGER PRIMARY KEY,
+    failed_at REAL NOT NULL,
+    error TEXT NOT NULL,
+    row TEXT NOT NULL
+);
+"""
+
+
+class FeedbackStore:
+    def __init__(self, path=FEEDBACK_DB, batch_size=256, flush_interval=0.5, max_attempts=5, retry_delay=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._queue = queue.Queue()
+        with contextlib.closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+        self._writer = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush, timeout=5)
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA busy_timeout=30000")
+        return connection
+
+    def submit(self, name, email, feedback, rating):
+        """Queue one submission; returns immediately without touching the database."""
+        self._queue.put((time.time(), name, email, feedback, int(rating)))
+
+    def flush(self, timeout=None):
+        """Wait until every queued submission has been written.
+
+        Returns False if ``timeout`` seconds passed first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, connection, batch):
+        ratings = Counter(row[4] for row in batch)
+        days = Counter()
+        day_ratings = Counter()
+        for submitted_at, _, _, _, rating in batch:
+            day = time.strftime("%Y-%m-%d", time.gmtime(submitted_at))
+            days[day] += 1
+            day_ratings[day] += rating
+        with connection:
+            connection.executemany(
+                "INSERT INTO feedback (submitted_at, name, email, feedback, rating) VALUES (?, ?, ?, ?, ?)",
+                batch
+            )
+            connection.executemany(
+                "INSERT INTO feedback_rating_counts (rating, count) VALUES (?, ?) "
+                "ON CONFLICT(rating) DO UPDATE SET count = count + excluded.count",
+                ratings.items()
+            )
+            connection.executemany(
+                "INSERT INTO feedback_daily_counts (day, count, rating_sum) VALUES (?, ?, ?) "
+                "ON CONFLICT(day) DO UPDATE SET count = count + excluded.count, "
+                "rating_sum = rating_sum + excluded.rating_sum",
+                [(day, count, day_ratings[day]) for day, count in days.items()]
+            )
+
+    def _dead_letter(self, connection, row, error):
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT INTO feedback_failed (failed_at, error, row) VALUES (?, ?, ?)",
+                    (time.time(), repr(error), repr(row))
+                )
+            logger.error("Moved a feedback submission to feedback_failed: %r", error)
+        except Exception:
+            logger.exception("Dropped a feedback submission that could not be written")
+
+    def _write_with_retries(self, connection, batch):
+        """Write ``batch`` as described in the module docstring; returns the connection to reuse."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                if connection is None:
+                    connection = self._connect()
+                self._write(connection, batch)
+                return connection
+            except Exception:
+                logger.warning(
+                    "Writing %d feedback submission(s) failed (attempt %d of %d)",
+                    len(batch), attempt, self.max_attempts, exc_info=True
+                )
+                if attempt < self.max_attempts:
+                    time.sleep(self.retry_delay * 2 ** (attempt - 1))
+        if connection is None:
+            logger.error("Dropped %d feedback submission(s): cannot open %s", len(batch), self.path)
+            return None
+        # Keep the rows that can be written; set the others aside
+        for row in batch:
+            try:
+                self._write(connection, [row])
+            except Exception as e:
+                self._dead_letter(connection, row, e)
+        return connection
+
+    def _run(self):
+        connection = None
+        while True:
+            batch = self._collect()
+            try:
+                connection = self._write_with_retries(connection, batch)
+            except Exception:
+                logger.exception("Feedback writer failed on a batch of %d submission(s)", len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def pending(self):
+        """Number of submissions queued but not yet written."""
+        return self._queue.qsize()
+
+    def rating_histogram(self):
+        """{rating: number of submissions} from the summary table."""
+        with contextlib.closing(self._connect()) as connection:
+            return dict(connection.execute("SELECT rating, count FROM feedback_rating_counts ORDER BY rating"))
+
+    def daily_counts(self):
+        """[(day, submissions, average rating)] from the summary table, oldest first."""
+        with contextlib.closing(self._connect()) as connection:
+            return connection.execute(
+                "SELECT day, count, CAST(rating_sum AS REAL) / count FROM feedback_daily_counts ORDER BY day"
+            ).fetchall()
@@ -1,6 +1,9 @@
 import streamlit as st
 import os
 
+import gallery_index
+import thumbnails
+
 # Custom CSS for adding background color and styling
 def add_custom_css():
     st.markdown(
@@ -32,28 +35,44 @@ def add_custom_css():
     )
 
 def display_images(category, image_list):
-    """Display images in a grid format with custom design."""
+    """Display image thumbnails in a grid; the full-resolution file loads only when viewed."""
     st.subheader(f"✨ {category}")
     if image_list:
         cols = st.columns(5)  # Display 5 images per row
         for idx, image in enumerate(image_list):
             with cols[idx % 5]:  # Display in a grid format
-                st.image(image, use_column_width=True, caption=f"📸 {os.path.basename(image).split('.')[0]}")
+                caption = f"📸 {image['name'].split('.')[0]}"
+                if image["width"]:
+                    caption += f" · {image['width']}×{image['height']}"
+                # Resolved per display: the variant is keyed on the file's current stat
+                st.image(thumbnails.thumbnail_path(image["path"]), use_column_width=True, caption=caption)
+                if st.button("🔍 View", key=f"view_{image['path']}"):
+                    st.session_state["gallery_selected"] = image["path"]
     else:
         st.warning(f"No images found for {category}. Ensure the image files are in the correct folder.")
 
-def load_images_from_folder(folder_path, image_extensions=[".jpg", ".png"]):
-    """Load image file paths from a specified folder."""
+@st.cache_resource
+def get_gallery_index():
+    """Process-wide gallery index shared by all sessions."""
+    return gallery_index.GalleryIndex()
+
+def load_images_from_folder(folder_path, image_extensions=gallery_index.IMAGE_EXTENSIONS):
+    """Load image metadata (path, dimensions, size, mtime) for a folder."""
     try:
-        return [
-            os.path.join(folder_path, file)
-            for file in os.listdir(folder_path)
-            if os.path.splitext(file)[1].lower() in image_extensions and os.path.exists(os.path.join(folder_path, file))
-        ]
+        return get_gallery_index().images(folder_path, image_extensions)
     except FileNotFoundError:
         st.error(f"Directory {folder_path} not found.")
         return []
 
+def display_selected_image():
+    """Show the image chosen with a View button at full resolution."""
+    selected = st.session_state.get("gallery_selected")
+    if selected and os.path.exists(selected):
+        st.image(selected, use_column_width=True, caption=f"📸 {os.path.basename(selected)}")
+        if st.button("✖️ Close", key="close_selected"):
+            st.session_state["gallery_selected"] = None
+            st.rerun()
+
 def main():
     add_custom_css()
     
@@ -74,6 +93,9 @@ def main():
         "🌈 Select Categories to Display", options=categories.keys(), default=list(categories.keys())
     )
 
+    # Full-resolution view of the image last clicked in the grid
+    selected_image = st.container()
+
     # Display images based on selected categories
     for category in selected_categories:
         path = categories[category]
@@ -83,6 +105,9 @@ def main():
         else:
             st.error(f"⚠️ Directory {path} not found. Please check the folder structure.")
 
+    with selected_image:
+        display_selected_image()
+
     # Add a colorful footer with spacing
     st.markdown("---")
     st.markdown("📸 *Images courtesy of astronomy enthusiasts around the globe.*", unsafe_allow_html=True)
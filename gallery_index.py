@@ -0,0 +1,82 @@
+"""Incrementally refreshed metadata index of the image gallery folders."""
+import os
+import threading
+
+from PIL import Image
+
+IMAGE_EXTENSIONS = (".jpg", ".png")
+
+
+class GalleryIndex:
+    """Maps each gallery folder to metadata about the images it contains.
+
+    A folder is rescanned with os.scandir when its own mtime changes (a file
+    was added, removed or renamed) or when one of its known images was
+    overwritten in place or deleted, which a stat of each indexed file
+    detects without listing the folder. During a rescan, images whose size
+    and mtime are unchanged keep their previous metadata, so only new or
+    modified files are opened to read their dimensions. Thumbnails are not
+    indexed; thumbnails.thumbnail_path resolves them on display.
+    """
+
+    def __init__(self):
+        self._folders = {}
+        self._lock = threading.Lock()
+
+    def _describe(self, entry, stat):
+        try:
+            with Image.open(entry.path) as image:
+                width, height = image.size
+        except OSError:
+            width = height = None
+        return {
+            "path": entry.path,
+            "name": entry.name,
+            "width": width,
+            "height": height,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns
+        }
+
+    def _scan(self, folder_path, image_extensions, previous):
+        images = {}
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if os.path.splitext(entry.name)[1].lower() not in image_extensions or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                known = previous.get(entry.name)
+                if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+                    images[entry.name] = known
+                else:
+                    images[entry.name] = self._describe(entry, stat)
+        return images
+
+    @staticmethod
+    def _unchanged(images):
+        for image in images.values():
+            try:
+                stat = os.stat(image["path"])
+            except OSError:
+                return False
+            if stat.st_size != image["size"] or stat.st_mtime_ns != image["mtime_ns"]:
+                return False
+        return True
+
+    def images(self, folder_path, image_extensions=IMAGE_EXTENSIONS):
+        """Metadata dicts of the images in ``folder_path``, sorted by file name.
+
+        Raises FileNotFoundError if the folder does not exist.
+        """
+        folder_mtime = os.stat(folder_path).st_mtime_ns
+        key = (folder_path, tuple(image_extensions))
+        with self._lock:
+            cached = self._folders.get(key)
+            if cached is None or cached["mtime_ns"] != folder_mtime or not self._unchanged(cached["images"]):
+                previous = cached["images"] if cached else {}
+                cached = {
+                    "mtime_ns": folder_mtime,
+                    "images": self._scan(folder_path, image_extensions, previous)
+                }
+                self._folders[key] = cached
+            return [cached["images"][name] for name in sorted(cached["images"])]
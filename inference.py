@@ -0,0 +1,192 @@
+"""Class probabilities, abstain rules and cached single-record inference."""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import instrumentation
+import model_registry
+
+# Decimal places kept per feature when building cache keys; slider steps are coarser
+KEY_DECIMALS = 4
+CACHE_SIZE = 4096
+
+# Slider ranges of the Predict page, used to draw rows for validating the fast path
+FEATURE_RANGES = {
+    'alpha': (0.0, 360.0),
+    'delta': (-90.0, 90.0),
+    'u': (0.0, 30.0),
+    'g': (0.0, 30.0),
+    'r': (0.0, 30.0),
+    'i': (0.0, 30.0),
+    'z': (0.0, 30.0),
+    'redshift': (0.0, 10.0),
+    'plate': (0, 9999),
+    'MJD': (0, 100000)
+}
+VALIDATION_ROWS = 256
+
+
+def decide(probabilities, classes, threshold=None, margin=None):
+    """Apply an abstain rule to a 2D array of class probabilities.
+
+    Returns (labels, confidences, abstain) arrays. Each label is the most
+    probable class and its confidence that class's probability. A row
+    abstains when its confidence is below ``threshold`` or it leads the
+    runner-up class by less than ``margin``; such objects are candidates for
+    spectroscopic follow-up. Without a rule no row abstains.
+    """
+    probabilities = np.asarray(probabilities)
+    top = probabilities.argmax(axis=1)
+    confidence = probabilities[np.arange(len(probabilities)), top]
+    abstain = np.zeros(len(probabilities), dtype=bool)
+    if threshold is not None:
+        abstain |= confidence < threshold
+    if margin is not None and probabilities.shape[1] > 1:
+        runner_up = np.partition(probabilities, -2, axis=1)[:, -2]
+        abstain |= confidence - runner_up < margin
+    return np.asarray(classes)[top], confidence, abstain
+
+
+class PredictionCache:
+    """Thread-safe LRU map from a quantized feature vector to (classes, probabilities).
+
+    Keys round each of the model's features to ``decimals`` places, so inputs
+    that differ only by float noise share an entry. The least recently used
+    entry is evicted once ``maxsize`` entries are stored.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE, decimals=KEY_DECIMALS):
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, values):
+        """Cache key for feature values given in model column order."""
+        return tuple(round(float(value), self.decimals) for value in values)
+
+    def get(self, key):
+        """Cached (classes, probabilities) for ``key``, or None; counts the hit or miss."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Hit and miss counts, hit rate and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize
+            }
+
+
+_lock = threading.Lock()
+_caches = {}
+_fast_path = {}
+
+
+def get_prediction_cache(path=model_registry.MODEL_PATH):
+    """Return the prediction cache of the model at ``path``, shared by every session."""
+    with _lock:
+        if path not in _caches:
+            _caches[path] = PredictionCache()
+        return _caches[path]
+
+
+def feature_row(values):
+    """One-row float32 array of feature values given in model column order.
+
+    CatBoost quantizes float features as float32 internally, so this is the
+    same input the DataFrame path produces after its conversion, without
+    paying for DataFrame construction and column inspection on every call.
+    """
+    return np.array([values], dtype=np.float32)
+
+
+def validation_rows(count=VALIDATION_ROWS, seed=0):
+    """DataFrame of the warm-up features plus ``count`` random rows within the slider ranges."""
+    rng = np.random.default_rng(seed)
+    rows = pd.DataFrame({
+        column: rng.uniform(low, high, count) if isinstance(low, float) else rng.integers(low, high + 1, count)
+        for column, (low, high) in FEATURE_RANGES.items()
+    })
+    warmup = pd.DataFrame(model_registry.WARMUP_FEATURES, index=[0])
+    return pd.concat([warmup, rows], ignore_index=True)[model_registry.FEATURE_COLUMNS]
+
+
+def fast_path_matches(model, rows=None):
+    """True if scoring rows one at a time through feature_row() reproduces the DataFrame path exactly."""
+    rows = validation_rows() if rows is None else rows[model_registry.FEATURE_COLUMNS]
+    expected = model.predict_proba(rows)
+    actual = np.concatenate([model.predict_proba(feature_row(values)) for values in rows.itertuples(index=False)])
+    return np.array_equal(expected, actual)
+
+
+def _use_fast_path(model, path):
+    # Validated once per model; fall back to DataFrames if the outputs ever differ
+    with _lock:
+        if path not in _fast_path:
+            _fast_path[path] = fast_path_matches(model)
+        return _fast_path[path]
+
+
+def _score(model, values, fast=True):
+    if fast:
+        features = feature_row(values)
+    else:
+        features = pd.DataFrame([values], columns=model_registry.FEATURE_COLUMNS)
+    return tuple(model.classes_), model.predict_proba(features)[0]
+
+
+def predict_one(features, threshold=None, margin=None, path=model_registry.MODEL_PATH):
+    """Classify one record given as a mapping of the model's feature columns.
+
+    Returns a dict with the predicted ``label``, its ``confidence``, whether
+    the record ``abstain``s under the threshold/margin rule (see decide) and
+    the per-class ``probabilities``, all from one predict_proba call.
+    Repeated inputs are answered from the process-wide cache without calling
+    the model; new inputs are scored as a single float32 row rather than a
+    DataFrame.
+    """
+    values = [features[column] for column in model_registry.FEATURE_COLUMNS]
+    cache = get_prediction_cache(path)
+    key = cache.key(values)
+    result = cache.get(key)
+    if result is None:
+        model = model_registry.get_model(path)
+        with instrumentation.section("inference"):
+            result = _score(model, key, fast=_use_fast_path(model, path))
+        cache.put(key, result)
+    classes, probabilities = result
+    labels, confidence, abstain = decide(probabilities[None, :], classes, threshold, margin)
+    return {
+        "label": labels[0],
+        "confidence": float(confidence[0]),
+        "abstain": bool(abstain[0]),
+        "probabilities": dict(zip(classes, probabilities.tolist()))
+    }
@@ -1,67 +1,112 @@
+import os
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import seaborn as sns
-import matplotlib.pyplot as plt
-import numpy as np
-import joblib
+import plotly.graph_objects as go
+
+import data_loader
+import density
+import downsample
+import evaluate
+import instrumentation
+import stats
+
+@st.cache_data
+def _read_evaluation(path, mtime_ns):
+    return evaluate.load_results(path)
+
+
+def load_evaluation(path=evaluate.EVALUATION_PATH):
+    """Stored evaluation results, re-read only when the file changes; None if missing."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _read_evaluation(path, mtime_ns)
 
 def main():
     st.title("🔭 Insights")
     st.write("Explore insights based on model predictions and data analysis.")
 
-    # Load dataset
-    @st.cache_data
-    def load_data():
-        try:
-            return pd.read_csv("star_classification.csv")
-        except Exception as e:
-            st.error(f"Error loading data: {e}")
-            return pd.DataFrame()  # Return empty DataFrame in case of error
-
-    data = load_data()
+    # Load dataset (shared across pages and sessions, see data_loader)
+    data = data_loader.load_data()
     
     if data.empty:
         st.stop()
 
-    # Load model
-    @st.cache_data
-    def load_model():
-        try:
-            return joblib.load("CatBoost_adv_stars_class.pkl")  # Adjust the path to your model file
-        except Exception as e:
-            st.error(f"Error loading model: {e}")
-            return None
-
-    model = load_model()
-
-    if model is None:
-        st.stop()
-
-    # Insights from the Model
-
-    # Model Performance Metrics
-    st.subheader("📈 Model Performance Metrics")
-    st.write("Evaluate the model's performance metrics.")
-    st.write("**Accuracy:** 95%")  # Example metric
-    st.write("**Precision:** 94%")  # Example metric
-    st.write("**Recall:** 96%")  # Example metric
-    st.write("**F1 Score:** 95%")  # Example metric
-
-    # Feature Importance
-    st.subheader("🔍 Feature Importance")
-    st.write("Understand the importance of each feature in model predictions.")
-    feature_names = ['alpha', 'delta', 'u', 'g', 'r', 'i', 'z', 'redshift']
-    importances = np.random.rand(len(feature_names))  # Example data
-    feature_importance_fig = px.bar(
-        x=feature_names,
-        y=importances,
-        title="Feature Importance",
-        labels={"x": "Feature", "y": "Importance"},
-        color=importances,
-        color_continuous_scale='Viridis'
-    )
-    st.plotly_chart(feature_importance_fig, use_container_width=True)
+    numeric_columns = data.select_dtypes("number").columns.tolist()
+
+    # Model insights come from the offline evaluation job (evaluate.py), not live inference
+    results = load_evaluation()
+    if results is None:
+        st.info("No evaluation results yet. Run `python evaluate.py`, or start the evaluation here.")
+    elif evaluate.is_stale(results):
+        st.warning("The data or model changed since the last evaluation; the results below may be out of date.")
+    if st.button("Run evaluation" if results is None else "Re-run evaluation"):
+        with st.spinner("Scoring the evaluation sample..."):
+            try:
+                evaluate.run()
+            except Exception as e:
+                st.error(f"Error evaluating model: {e}")
+            else:
+                results = load_evaluation()
+
+    if results is not None:
+        # Model Performance Metrics
+        st.subheader("📈 Model Performance Metrics")
+        # Results written before the rename store the fraction as "test_size"
+        sample_size = results["source"].get("sample_size", results["source"].get("test_size"))
+        st.write(
+            f"Evaluated on a random sample of {results['rows']:,} rows of the dataset "
+            f"({sample_size:.0%} of each class), not a held-out split. The model's training rows "
+            "are unknown, so the sample may overlap them and the scores below are likely optimistic."
+        )
+        st.write(f"**Accuracy:** {results['accuracy']:.2%}")
+        st.write(f"**Precision:** {results['macro']['precision']:.2%} (macro average)")
+        st.write(f"**Recall:** {results['macro']['recall']:.2%} (macro average)")
+        st.write(f"**F1 Score:** {results['macro']['f1']:.2%} (macro average)")
+        st.dataframe(pd.DataFrame({
+            label: {
+                "Precision": metrics["precision"],
+                "Recall": metrics["recall"],
+                "F1 Score": metrics["f1"],
+                "ROC AUC": metrics["roc"]["auc"],
+                "Average Precision": metrics["pr"]["average_precision"],
+                "Support": metrics["support"]
+            }
+            for label, metrics in results["per_class"].items()
+        }).T)
+
+        # Confusion Matrix
+        st.subheader("🧮 Confusion Matrix")
+        st.write("Rows are the true classes, columns the predicted classes.")
+        with instrumentation.section("chart: confusion matrix"):
+            confusion_fig = px.imshow(
+                results["confusion_matrix"],
+                x=results["classes"],
+                y=results["classes"],
+                text_auto=True,
+                labels={"x": "Predicted", "y": "Actual", "color": "Objects"},
+                title="Confusion Matrix"
+            )
+            instrumentation.plotly_chart(confusion_fig, use_container_width=True)
+
+        # Feature Importance
+        st.subheader("🔍 Feature Importance")
+        st.write("Understand the importance of each feature in model predictions.")
+        with instrumentation.section("chart: feature importance"):
+            feature_names = list(results["feature_importance"])
+            importances = list(results["feature_importance"].values())
+            feature_importance_fig = px.bar(
+                x=feature_names,
+                y=importances,
+                title="Feature Importance",
+                labels={"x": "Feature", "y": "Importance"},
+                color=importances,
+                color_continuous_scale='Viridis'
+            )
+            instrumentation.plotly_chart(feature_importance_fig, use_container_width=True)
 
     # Interactive Feature Exploration
     st.subheader("🔍 Interactive Feature Exploration")
@@ -69,85 +114,83 @@ def main():
     x_feature = st.selectbox("Choose feature for X axis:", data.columns.tolist())
     y_feature = st.selectbox("Choose feature for Y axis:", data.columns.tolist())
     if x_feature and y_feature:
-        scatter_fig = px.scatter(
-            data,
-            x=x_feature,
-            y=y_feature,
-            color="class",
-            title=f"Scatter Plot of {x_feature} vs {y_feature}",
-            color_continuous_scale='Rainbow'
-        )
-        st.plotly_chart(scatter_fig, use_container_width=True)
-
-    # Model Predictions Analysis
-    
-
-    # ROC Curve
-    st.subheader("📈 ROC Curve")
-    st.write("Plot the ROC curve for model performance.")
-    if model:
-        # Dummy ROC curve example
-        fpr = np.linspace(0, 1, 100)
-        tpr = np.linspace(0, 1, 100)
-        roc_curve_fig = px.line(
-            x=fpr,
-            y=tpr,
-            title="ROC Curve",
-            labels={"x": "False Positive Rate", "y": "True Positive Rate"},
-            line_shape='linear'
-        )
-        st.plotly_chart(roc_curve_fig, use_container_width=True)
-
-    # Precision-Recall Curve
-    st.subheader("📉 Precision-Recall Curve")
-    st.write("Plot the Precision-Recall curve for model performance.")
-    if model:
-        # Dummy Precision-Recall curve example
-        precision = np.linspace(0, 1, 100)
-        recall = np.linspace(0, 1, 100)
-        pr_curve_fig = px.line(
-            x=recall,
-            y=precision,
-            title="Precision-Recall Curve",
-            labels={"x": "Recall", "y": "Precision"},
-            line_shape='linear'
-        )
-        st.plotly_chart(pr_curve_fig, use_container_width=True)
+        with instrumentation.section("chart: feature exploration"):
+            scatter_fig = px.scatter(
+                downsample.sample_points([x_feature, y_feature, "class"]),
+                x=x_feature,
+                y=y_feature,
+                color="class",
+                title=f"Scatter Plot of {x_feature} vs {y_feature}",
+                color_continuous_scale='Rainbow'
+            )
+            instrumentation.plotly_chart(scatter_fig, use_container_width=True)
+
+    if results is not None:
+        # ROC Curve
+        st.subheader("📈 ROC Curve")
+        st.write("One-vs-rest ROC curve of each class on the evaluation sample.")
+        with instrumentation.section("chart: ROC curve"):
+            roc_curve_fig = go.Figure()
+            for label, metrics in results["per_class"].items():
+                roc_curve_fig.add_trace(go.Scatter(
+                    x=metrics["roc"]["fpr"],
+                    y=metrics["roc"]["tpr"],
+                    mode="lines",
+                    name=f"{label} (AUC {metrics['roc']['auc']:.3f})"
+                ))
+            roc_curve_fig.add_trace(go.Scatter(x=[0, 1], y=[0, 1], mode="lines", line=dict(dash="dash", color="gray"), showlegend=False))
+            roc_curve_fig.update_layout(title="ROC Curve", xaxis_title="False Positive Rate", yaxis_title="True Positive Rate")
+            instrumentation.plotly_chart(roc_curve_fig, use_container_width=True)
+
+        # Precision-Recall Curve
+        st.subheader("📉 Precision-Recall Curve")
+        st.write("One-vs-rest precision-recall curve of each class on the evaluation sample.")
+        with instrumentation.section("chart: precision-recall curve"):
+            pr_curve_fig = go.Figure()
+            for label, metrics in results["per_class"].items():
+                pr_curve_fig.add_trace(go.Scatter(
+                    x=metrics["pr"]["recall"],
+                    y=metrics["pr"]["precision"],
+                    mode="lines",
+                    name=f"{label} (AP {metrics['pr']['average_precision']:.3f})"
+                ))
+            pr_curve_fig.update_layout(title="Precision-Recall Curve", xaxis_title="Recall", yaxis_title="Precision")
+            instrumentation.plotly_chart(pr_curve_fig, use_container_width=True)
 
     # Feature Distribution
     st.subheader("📈 Feature Distribution")
     st.write("Visualize the distribution of selected features.")
     feature_dist = st.selectbox("Choose feature to visualize:", data.columns.tolist())
     if feature_dist:
-        feature_dist_fig = px.histogram(
-            data,
-            x=feature_dist,
-            title=f"Distribution of {feature_dist}",
-            color_discrete_sequence=['orchid']
-        )
-        st.plotly_chart(feature_dist_fig, use_container_width=True)
+        with instrumentation.section("chart: feature distribution"):
+            feature_dist_fig = stats.histogram_figure(
+                feature_dist,
+                title=f"Distribution of {feature_dist}",
+                color_discrete_sequence=['orchid']
+            )
+            instrumentation.plotly_chart(feature_dist_fig, use_container_width=True)
 
     # Box Plot for Multiple Features
     st.subheader("📦 Box Plot for Multiple Features")
     st.write("Visualize distributions of selected features using box plots.")
     box_features = st.multiselect("Choose features for box plot:", data.columns.tolist(), default=["alpha", "delta"])
     if len(box_features) > 0:
-        box_plot_fig = px.box(
-            data,
-            y=box_features,
-            title="Box Plot of Selected Features",
-            color_discrete_sequence=['lightseagreen']
-        )
-        st.plotly_chart(box_plot_fig, use_container_width=True)
+        with instrumentation.section("chart: box plot"):
+            box_plot_fig = px.box(
+                data,
+                y=box_features,
+                title="Box Plot of Selected Features",
+                color_discrete_sequence=['lightseagreen']
+            )
+            instrumentation.plotly_chart(box_plot_fig, use_container_width=True)
 
     # Violin Plot
     st.subheader("🎻 Violin Plot")
     st.write("Visualize the distribution of a feature using a violin plot.")
-    violin_feature = st.selectbox("Choose feature for violin plot:", data.columns.tolist())
+    violin_feature = st.selectbox("Choose feature for violin plot:", numeric_columns)
     if violin_feature:
-        violin_plot = sns.violinplot(data=data, y=violin_feature, palette="crest")
-        st.pyplot(violin_plot.figure)
-        plt.close()
+        with instrumentation.section("chart: violin plot"):
+            instrumentation.plotly_chart(density.violin_figure(violin_feature, color="#3a8d9c"), use_container_width=True)
 
 
 
@@ -155,20 +198,20 @@ def main():
     # Density Plot
     st.subheader("🔍 Density Plot")
     st.write("Visualize the density distribution of selected features.")
-    density_features = st.multiselect("Choose features for density plot:", data.columns.tolist(), default=["alpha", "delta"])
+    density_features = st.multiselect("Choose features for density plot:", numeric_columns, default=["alpha", "delta"])
     if len(density_features) > 0:
-        density_plot = sns.kdeplot(data[density_features], palette="tab10")
-        st.pyplot(density_plot.figure)
-        plt.close()
+        with instrumentation.section("chart: density plot"):
+            density_fig = density.kde_figure(density_features, title="Density Plot", colors=px.colors.qualitative.T10)
+            instrumentation.plotly_chart(density_fig, use_container_width=True)
 
     # KDE Plot
     st.subheader("🌈 KDE Plot")
     st.write("Visualize Kernel Density Estimate of a selected feature.")
-    kde_feature = st.selectbox("Choose feature for KDE plot:", data.columns.tolist())
+    kde_feature = st.selectbox("Choose feature for KDE plot:", numeric_columns)
     if kde_feature:
-        kde_plot = sns.kdeplot(data[kde_feature], fill=True, color='salmon')
-        st.pyplot(kde_plot.figure)
-        plt.close()
+        with instrumentation.section("chart: KDE plot"):
+            kde_fig = density.kde_figure([kde_feature], title=f"KDE of {kde_feature}", fill=True, colors=['salmon'])
+            instrumentation.plotly_chart(kde_fig, use_container_width=True)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,147 @@
+"""Wall time, CPU time and peak memory of named sections of a rerun.
+
+main.py opens a run around each page rerun; code inside it marks sections
+with ``section(name)`` or the ``timed()`` decorator. Sections nest, and
+each records its wall time, the CPU time of the current thread and, when
+memory tracing is on, the peak Python heap growth (tracemalloc, which also
+sees NumPy buffers). Until the app has opened a run the helpers only call
+through, so library code shared with the CLI tools can be instrumented
+freely.
+
+tracemalloc's peak is process-wide and each section resets it, so peak
+memory is only meaningful while a single session is rerunning: concurrent
+sessions or fragment threads allocate into, and reset, the same counter.
+Wall and CPU times are per thread and stay valid under concurrency.
+
+Once the app is running, a section entered with no open run (a fragment
+rerunning on its own) becomes a run of its own. Finished runs are logged
+as one JSON line each on the ``star_app.timing`` logger; setting
+STAR_APP_TIMING_LOG to a path appends them to that file.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger("star_app.timing")
+if os.environ.get("STAR_APP_TIMING_LOG"):
+    _handler = logging.FileHandler(os.environ["STAR_APP_TIMING_LOG"])
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+# Each script rerun and fragment rerun runs on its own thread
+_local = threading.local()
+_app_started = False
+
+
+class _Run:
+    def __init__(self, name, trace_memory):
+        self.name = name
+        self.trace_memory = trace_memory
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.sections = []
+        self.stack = []
+
+
+def start_run(name, trace_memory=False):
+    """Open a run on this thread, discarding one left open by an interrupted rerun."""
+    global _app_started
+    _app_started = True
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _local.run = _Run(name, trace_memory)
+
+
+def finish_run():
+    """Close this thread's run, log it and return it as a dict (None if no run is open)."""
+    run = getattr(_local, "run", None)
+    if run is None:
+        return None
+    _local.run = None
+    record = {
+        "run": run.name,
+        "started_at": run.started_at,
+        "wall_ms": (time.perf_counter() - run.start) * 1000,
+        "sections": run.sections
+    }
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(record))
+    return record
+
+
+@contextmanager
+def section(name):
+    """Record the wall time, CPU time and peak memory of the enclosed block."""
+    run = getattr(_local, "run", None)
+    if run is None and not _app_started:
+        yield
+        return
+    owns_run = run is None
+    if owns_run:
+        start_run(name, trace_memory=tracemalloc.is_tracing())
+        run = _local.run
+
+    trace_memory = run.trace_memory and tracemalloc.is_tracing()
+    frame = {"name": name, "depth": len(run.stack), "peak": 0}
+    if trace_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        if run.stack:
+            run.stack[-1]["peak"] = max(run.stack[-1]["peak"], peak)
+        tracemalloc.reset_peak()
+        frame["base"] = current
+    record = {
+        "name": name,
+        "depth": frame["depth"],
+        "offset_ms": (time.perf_counter() - run.start) * 1000
+    }
+    # Keep the record's position so nested sections are listed after their parent
+    run.sections.append(record)
+    run.stack.append(frame)
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield
+    finally:
+        record["wall_ms"] = (time.perf_counter() - wall_start) * 1000
+        record["cpu_ms"] = (time.thread_time() - cpu_start) * 1000
+        run.stack.pop()
+        record["peak_memory_bytes"] = None
+        if trace_memory:
+            peak = max(tracemalloc.get_traced_memory()[1], frame["peak"])
+            record["peak_memory_bytes"] = max(peak - frame["base"], 0)
+            if run.stack:
+                run.stack[-1]["peak"] = max(run.stack[-1]["peak"], peak)
+        if owns_run:
+            finish_run()
+
+
+def timed(name=None):
+    """Decorator form of section(), named after the function by default."""
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with section(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def plotly_chart(figure, **kwargs):
+    """st.plotly_chart, timed as a "render" section named after the figure title.
+
+    This only covers serializing and sending the figure; pages wrap building
+    it together with this call in a "chart" section.
+    """
+    import streamlit as st
+
+    title = figure.layout.title.text or "untitled"
+    with section(f"render: {title}"):
+        return st.plotly_chart(figure, **kwargs)
@@ -1,11 +1,20 @@
+import json
+import logging
+import os
+import threading
+
 import streamlit as st
 from streamlit.components.v1 import html
 
+import instrumentation
+import startup_profile
+import thumbnails
+
 # Set page configuration once at the start
 st.set_page_config(page_title="Star Classification App", page_icon="🌟", layout="wide")
 
 # Sidebar image
-st.sidebar.image("Universe_2.jpg", use_column_width=True)
+st.sidebar.image(thumbnails.thumbnail_path("Universe_2.jpg", thumbnails.SIDEBAR_SIZE), use_column_width=True)
 
 # Custom CSS for colorful and interactive styling
 st.markdown("""
@@ -86,6 +95,9 @@ st.markdown("""
 # Theme Toggle
 
 
+# STAR_APP_PROFILE=1 shows import times and per-rerun section timings in the sidebar
+profiling = os.environ.get("STAR_APP_PROFILE") == "1"
+
 # Page selection with emojis
 page = st.sidebar.selectbox("Select a page", [
     "🚀 Predict",
@@ -103,35 +115,92 @@ user_name = st.text_input("Please enter your name:", placeholder=" Your name ")
 if user_name:
     st.markdown(f"### Welcome to the Star Classification App, {user_name}! 🌟")
 
-# Load the appropriate page based on the selection
-if page == "🚀 Predict":
-    import predict
-    predict.main()
-elif page == "✨ Recommend":
-    import recommend
-    recommend.main()
-elif page == "📊 Visualize":
-    import visualize
-    visualize.main()
-elif page == "🔍 Analyze":
-    import analyze
-    analyze.main()
-elif page == "🔭 Insights":
-    import insights
-    insights.main()
-elif page == "🖼️ Gallery":
-    import gallery
-    gallery.main()
-elif page == "📝 Feedback":
-    import feedback
-    feedback.main()
-elif page == "📚 About":
-    import about
-    about.main()
+@st.cache_resource(show_spinner=False)
+def warm_model():
+    """Load and warm up the model once per process, off the script thread.
+
+    The first Predict rerun then finds it ready (get_model waits for a load
+    in progress), and a missing or broken model file only logs an error
+    instead of taking down the other pages.
+    """
+    def warm():
+        try:
+            import model_registry
+            model_registry.get_model()
+        except Exception:
+            logging.getLogger("star_app").exception("Model warm-up failed")
+
+    thread = threading.Thread(target=warm, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+warm_model()
+
+# Load the appropriate page based on the selection, timing its sections (see instrumentation)
+instrumentation.start_run(page, trace_memory=profiling)
+try:
+    if page == "🚀 Predict":
+        predict = startup_profile.import_page("predict")
+        predict.main()
+    elif page == "✨ Recommend":
+        recommend = startup_profile.import_page("recommend")
+        recommend.main()
+    elif page == "📊 Visualize":
+        visualize = startup_profile.import_page("visualize")
+        visualize.main()
+    elif page == "🔍 Analyze":
+        analyze = startup_profile.import_page("analyze")
+        analyze.main()
+    elif page == "🔭 Insights":
+        insights = startup_profile.import_page("insights")
+        insights.main()
+    elif page == "🖼️ Gallery":
+        gallery = startup_profile.import_page("gallery")
+        gallery.main()
+    elif page == "📝 Feedback":
+        feedback = startup_profile.import_page("feedback")
+        feedback.main()
+    elif page == "📚 About":
+        about = startup_profile.import_page("about")
+        about.main()
+finally:
+    rerun_timings = instrumentation.finish_run()
+
+# Profiling panels: page import times and where this rerun spent its time
+if profiling:
+    with st.sidebar.expander("⏱️ Page import times"):
+        for module_name, seconds in sorted(startup_profile.IMPORT_TIMES.items(), key=lambda item: item[1], reverse=True):
+            st.write(f"`{module_name}`: {seconds * 1000:.0f} ms")
+        st.caption("Run `python startup_profile.py` for a per-package cold-start breakdown.")
+    with st.sidebar.expander("⏱️ Rerun timings"):
+        st.write(f"Page rerun: {rerun_timings['wall_ms']:.0f} ms")
+        st.dataframe(
+            [
+                {
+                    "Section": "  " * record["depth"] + record["name"],
+                    "Wall (ms)": round(record["wall_ms"], 1),
+                    "CPU (ms)": round(record["cpu_ms"], 1),
+                    "Peak memory (MB)": None if record["peak_memory_bytes"] is None else round(record["peak_memory_bytes"] / 1e6, 2)
+                }
+                for record in rerun_timings["sections"]
+            ],
+            hide_index=True
+        )
+        st.download_button(
+            "Download timings (JSON)",
+            data=json.dumps(rerun_timings, indent=2),
+            file_name="rerun_timings.json",
+            mime="application/json"
+        )
+        st.caption(
+            "Peak memory is process-wide, so it is only accurate while no other session is rerunning. "
+            "Set STAR_APP_TIMING_LOG to a file path to log every rerun as a JSON line."
+        )
 
 # Display the main image below the title
 
-st.image("Galaxy.jpg", caption="A glimpse of the galaxy", use_column_width=True)
+st.image(thumbnails.thumbnail_path("Galaxy.jpg", thumbnails.DISPLAY_SIZE), caption="A glimpse of the galaxy", use_column_width=True)
 # Adding a footer with colorful styling
 st.markdown("""
     <div class="footer">
@@ -0,0 +1,198 @@
+"""Export the pickled model to other runtimes and benchmark them against the pickle.
+
+Usage:
+    python model_export.py [--rows 100000] [--repeats 500] [--skip-export]
+
+Writes the CatBoost model to native .cbm, ONNX and standalone C++ files in
+models/, then loads every backend Python can run (pickle, .cbm and, when
+onnxruntime is installed, ONNX) and compares load time, single-row latency
+and batch throughput on the same rows. Backends whose labels match the
+pickle's and whose probabilities agree within TOLERANCE are ranked by
+single-row latency in models/backends.json, which model_registry uses to
+pick the model the app loads. An export only ranks above the pickle when
+its median latency is at least MIN_SPEEDUP lower, so timing noise does
+not switch backends. The C++ file is for embedding in native
+services; it has no Python loader and is not benchmarked.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import joblib
+import numpy as np
+
+import data_loader
+import inference
+import model_registry
+
+# Format name passed to CatBoost's save_model, by file extension
+EXPORT_FORMATS = {".cbm": "cbm", ".onnx": "onnx", ".cpp": "cpp"}
+
+# Largest probability difference from the pickle accepted for ranking; ONNX computes in float32
+TOLERANCE = 1e-6
+
+# Fraction by which an export's p50 latency must beat the pickle's to rank above it
+MIN_SPEEDUP = 0.10
+
+DEFAULT_ROWS = 100_000
+DEFAULT_REPEATS = 500
+
+
+def export_paths(pickle_path=model_registry.PICKLE_PATH, export_dir=model_registry.EXPORT_DIR):
+    """{extension: path} of the exported copies of ``pickle_path``."""
+    name = os.path.splitext(os.path.basename(pickle_path))[0]
+    return {extension: os.path.join(export_dir, name + extension) for extension in EXPORT_FORMATS}
+
+
+def export(pickle_path=model_registry.PICKLE_PATH, export_dir=model_registry.EXPORT_DIR):
+    """Write every export format of the pickled model and return their paths."""
+    model = joblib.load(pickle_path)
+    os.makedirs(export_dir, exist_ok=True)
+    paths = export_paths(pickle_path, export_dir)
+    for extension, path in paths.items():
+        model.save_model(path, format=EXPORT_FORMATS[extension])
+    return paths
+
+
+def benchmark_rows(count=DEFAULT_ROWS, data_path=data_loader.DATA_PATH):
+    """``count`` feature rows in model column order, from the dataset when it is available."""
+    try:
+        data = data_loader.read_star_data(data_path, columns=model_registry.FEATURE_COLUMNS)
+    except OSError:
+        data = inference.validation_rows(count)
+    rows = data[model_registry.FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+    return np.resize(rows, (count, rows.shape[1]))
+
+
+def cold_load_seconds(path, python=sys.executable):
+    """Seconds a fresh interpreter needs to load ``path``, including importing its runtime."""
+    script = (
+        "import sys, time, model_registry; start = time.perf_counter(); "
+        "model_registry.load_model_file(sys.argv[1]); print(time.perf_counter() - start)"
+    )
+    result = subprocess.run(
+        [python, "-c", script, path],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)) or None
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark(path, rows, repeats=DEFAULT_REPEATS):
+    """Load time, single-row latency, batch throughput and batch probabilities of one backend."""
+    load_seconds = cold_load_seconds(os.path.abspath(path))
+    model = model_registry.load_model_file(path)
+    model.predict_proba(rows[:1])
+
+    latencies = []
+    for row in rows[:repeats]:
+        start = time.perf_counter()
+        model.predict_proba(row[None, :])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    probabilities = model.predict_proba(rows)
+    batch_seconds = time.perf_counter() - start
+    return {
+        "path": path,
+        "file_bytes": os.path.getsize(path),
+        "load_seconds": load_seconds,
+        "single_row_p50_ms": float(np.percentile(latencies, 50)) * 1000,
+        "single_row_p99_ms": float(np.percentile(latencies, 99)) * 1000,
+        "batch_rows_per_second": len(rows) / batch_seconds,
+        "classes": [str(label) for label in model.classes_]
+    }, probabilities
+
+
+def compare(rows, repeats=DEFAULT_REPEATS, pickle_path=model_registry.PICKLE_PATH, export_dir=model_registry.EXPORT_DIR):
+    """Benchmark the pickle and every loadable export on ``rows``.
+
+    Each result records whether its labels are identical to the pickle's
+    and the largest absolute probability difference.
+    """
+    candidates = [pickle_path] + [
+        path for extension, path in export_paths(pickle_path, export_dir).items()
+        if extension != ".cpp" and model_registry.backend_available(path)
+    ]
+    results = []
+    baseline = None
+    for path in candidates:
+        result, probabilities = benchmark(path, rows, repeats)
+        if baseline is None:
+            baseline = (result["classes"], probabilities)
+        result["labels_identical"] = result["classes"] == baseline[0] and bool(
+            np.array_equal(probabilities.argmax(axis=1), baseline[1].argmax(axis=1))
+        )
+        result["max_probability_difference"] = float(np.abs(probabilities - baseline[1]).max()) if result["labels_identical"] else None
+        results.append(result)
+    return results
+
+
+def rank_backends(results, pickle_path=model_registry.PICKLE_PATH, min_speedup=MIN_SPEEDUP):
+    """Paths of the backends that reproduce the pickle, fastest single-row latency first.
+
+    Exports that are not at least ``min_speedup`` faster than the pickle are
+    ranked after it, since smaller differences are within timing noise.
+    """
+    matching = sorted(
+        (
+            result for result in results
+            if result["labels_identical"] and result["max_probability_difference"] <= TOLERANCE
+        ),
+        key=lambda result: result["single_row_p50_ms"]
+    )
+    baseline = next((result for result in matching if result["path"] == pickle_path), None)
+    if baseline is None:
+        return [result["path"] for result in matching]
+    cutoff = baseline["single_row_p50_ms"] * (1 - min_speedup)
+    faster = [result["path"] for result in matching if result is not baseline and result["single_row_p50_ms"] <= cutoff]
+    return faster + [pickle_path] + [
+        result["path"] for result in matching if result is not baseline and result["path"] not in faster
+    ]
+
+
+def write_ranking(results, pickle_path=model_registry.PICKLE_PATH, ranking_path=model_registry.BACKEND_RANKING_PATH):
+    """Rank the backends that reproduce the pickle (see rank_backends) and save the ranking."""
+    ranking = {
+        "source": model_registry._file_signature(pickle_path),
+        "min_speedup": MIN_SPEEDUP,
+        "ranking": rank_backends(results, pickle_path),
+        "results": results
+    }
+    os.makedirs(os.path.dirname(ranking_path) or ".", exist_ok=True)
+    data_loader._write_atomic(ranking_path, lambda tmp: data_loader._write_json(tmp, ranking))
+    return ranking
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the model and compare inference backends.")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Rows in the batch throughput test")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Single-row predictions timed per backend")
+    parser.add_argument("--skip-export", action="store_true", help="Benchmark existing exports without rewriting them")
+    args = parser.parse_args()
+
+    if not args.skip_export:
+        for path in export().values():
+            print(f"Wrote {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+    results = compare(benchmark_rows(args.rows), args.repeats)
+    print(f"\n{'backend':<40} {'load':>9} {'p50':>9} {'p99':>9} {'batch rows/s':>14}  matches pickle")
+    for result in results:
+        difference = result["max_probability_difference"]
+        match = "labels differ" if difference is None else f"max |dp| {difference:.1e}"
+        print(
+            f"{result['path']:<40} {result['load_seconds'] * 1000:7.1f}ms "
+            f"{result['single_row_p50_ms']:7.3f}ms {result['single_row_p99_ms']:7.3f}ms "
+            f"{result['batch_rows_per_second']:14,.0f}  {match}"
+        )
+    ranking = write_ranking(results)
+    preferred = ranking["ranking"][0] if ranking["ranking"] else model_registry.PICKLE_PATH
+    print(f"\nThe app will load {preferred} (ranking saved to {model_registry.BACKEND_RANKING_PATH})")
+
+
+if __name__ == "__main__":
+    main()
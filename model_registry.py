@@ -0,0 +1,169 @@
+import importlib.util
+import json
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+import instrumentation
+
+PICKLE_PATH = "CatBoost_adv_stars_class.pkl"
+
+# Exported copies of the pickle (see model_export.py) and the benchmark ranking
+# of the backends that reproduced its predictions, fastest first
+EXPORT_DIR = "models"
+BACKEND_RANKING_PATH = os.path.join(EXPORT_DIR, "backends.json")
+
+# Column order the CatBoost model was trained on
+FEATURE_COLUMNS = ['alpha', 'delta', 'u', 'g', 'r', 'i', 'z', 'redshift', 'plate', 'MJD']
+
+# Slider defaults from the Predict page, used to warm the model up
+WARMUP_FEATURES = {
+    'alpha': 180.0,
+    'delta': 0.0,
+    'u': 15.0,
+    'g': 15.0,
+    'r': 15.0,
+    'i': 15.0,
+    'z': 15.0,
+    'redshift': 0.5,
+    'plate': 1000,
+    'MJD': 50000
+}
+
+
+class OnnxModel:
+    """predict/predict_proba adapter over an ONNX Runtime session of an exported CatBoost model."""
+
+    def __init__(self, path):
+        import onnxruntime
+
+        self.session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self._input = self.session.get_inputs()[0].name
+        self.feature_names_ = list(FEATURE_COLUMNS)
+        # The exported graph returns one {class: probability} map per row
+        _, maps = self.session.run(None, {self._input: np.zeros((1, len(FEATURE_COLUMNS)), dtype=np.float32)})
+        self.classes_ = np.array(list(maps[0]))
+
+    def predict_proba(self, features):
+        if isinstance(features, pd.DataFrame):
+            features = features[FEATURE_COLUMNS].to_numpy()
+        _, maps = self.session.run(None, {self._input: np.asarray(features, dtype=np.float32)})
+        return np.array([[row[label] for label in self.classes_] for row in maps], dtype=np.float64)
+
+    def predict(self, features):
+        return self.classes_[self.predict_proba(features).argmax(axis=1)][:, None]
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def backend_available(path):
+    """True if ``path`` exists and the runtime needed to load it is installed."""
+    if not os.path.exists(path):
+        return False
+    if path.endswith(".onnx"):
+        return importlib.util.find_spec("onnxruntime") is not None
+    return True
+
+
+def preferred_model_path(ranking_path=BACKEND_RANKING_PATH, pickle_path=PICKLE_PATH):
+    """Path of the fastest exported backend that reproduced the pickle, or the pickle itself.
+
+    The ranking is ignored once the pickle has changed since it was exported.
+    """
+    try:
+        with open(ranking_path) as f:
+            ranking = json.load(f)
+        if ranking["source"] != _file_signature(pickle_path):
+            return pickle_path
+    except (OSError, ValueError, KeyError):
+        return pickle_path
+    for path in ranking["ranking"]:
+        if backend_available(path):
+            return path
+    return pickle_path
+
+
+def load_model_file(path):
+    """Load a model from a joblib pickle, a native CatBoost .cbm file or an ONNX export."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".cbm":
+        from catboost import CatBoostClassifier
+
+        model = CatBoostClassifier()
+        model.load_model(path, format="cbm")
+        return model
+    if extension == ".onnx":
+        return OnnxModel(path)
+    return joblib.load(path)
+
+
+# STAR_MODEL_PATH pins a specific model file; otherwise the benchmark ranking decides
+MODEL_PATH = os.environ.get("STAR_MODEL_PATH") or preferred_model_path()
+
+_lock = threading.Lock()
+_models = {}
+_stats = {}
+
+
+def _rss_bytes():
+    """Return the resident set size of this process in bytes, or None if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _load(path):
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    model = load_model_file(path)
+    load_seconds = time.perf_counter() - start
+
+    # The first predict call builds CatBoost's internal evaluators; pay for it now
+    start = time.perf_counter()
+    model.predict(pd.DataFrame(WARMUP_FEATURES, index=[0])[FEATURE_COLUMNS])
+    warmup_seconds = time.perf_counter() - start
+
+    rss_after = _rss_bytes()
+    memory_bytes = None
+    if rss_before is not None and rss_after is not None:
+        memory_bytes = max(rss_after - rss_before, 0)
+
+    stats = {
+        "path": path,
+        "file_bytes": os.path.getsize(path),
+        "load_seconds": load_seconds,
+        "warmup_seconds": warmup_seconds,
+        "memory_bytes": memory_bytes
+    }
+    return model, stats
+
+
+def get_model(path=MODEL_PATH):
+    """Return the warmed-up model for ``path``, loading it once per process.
+
+    The model is shared by every page and session, so callers must treat it as
+    read-only. Loading errors propagate to the caller.
+    """
+    model = _models.get(path)
+    if model is not None:
+        return model
+    with _lock:
+        if path not in _models:
+            with instrumentation.section("model load"):
+                _models[path], _stats[path] = _load(path)
+        return _models[path]
+
+
+def model_info(path=MODEL_PATH):
+    """Return load time, warm-up time and memory footprint of a loaded model."""
+    get_model(path)
+    return dict(_stats[path])
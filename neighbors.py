@@ -0,0 +1,179 @@
+import numpy as np
+
+# Features compared by the Recommend page
+FEATURE_COLUMNS = ["alpha", "delta", "u", "g", "r", "i", "z", "redshift"]
+
+# Rows scanned per step; bounds the temporary difference matrix to a few MB
+BLOCK_SIZE = 65536
+
+
+def _sky_vectors(alpha, delta):
+    """Unit vectors for sky positions given in degrees."""
+    alpha = np.radians(alpha)
+    delta = np.radians(delta)
+    cos_delta = np.cos(delta)
+    return np.column_stack([cos_delta * np.cos(alpha), cos_delta * np.sin(alpha), np.sin(delta)])
+
+
+class EuclideanMetric:
+    """Plain Euclidean distance on the raw feature values.
+
+    Every metric maps raw feature rows (in FEATURE_COLUMNS order) into an
+    embedding where Euclidean distance is the metric, so indexes can store a
+    single float32 matrix and share one query routine. ``terms`` names the
+    feature each embedded column belongs to, which is what weights apply to.
+    """
+
+    name = "euclidean"
+    label = "Euclidean (raw values)"
+    terms = FEATURE_COLUMNS
+    # Whether per-term weights change the ranking
+    weighted = True
+
+    def fit(self, features):
+        return self
+
+    def embed(self, features):
+        return features
+
+    def transform(self, features):
+        features = np.atleast_2d(np.asarray(features, dtype=np.float64))
+        return np.ascontiguousarray(self.embed(features), dtype=np.float32)
+
+    def to_distance(self, embedded):
+        return embedded
+
+
+class StandardizedMetric(EuclideanMetric):
+    """Euclidean distance after z-scoring each feature over the whole dataset."""
+
+    name = "standardized"
+    label = "Standardized (z-scores)"
+
+    def fit(self, features):
+        self.mean = features.mean(axis=0)
+        std = features.std(axis=0)
+        self.std = np.where(std > 0, std, 1.0)
+        return self
+
+    def embed(self, features):
+        return (features - self.mean) / self.std
+
+
+class SkyMetric(EuclideanMetric):
+    """Great-circle separation on alpha/delta, reported in degrees."""
+
+    name = "sky"
+    label = "Sky position (great-circle)"
+    terms = ["sky", "sky", "sky"]
+    weighted = False
+
+    def embed(self, features):
+        return _sky_vectors(features[:, 0], features[:, 1])
+
+    def to_distance(self, embedded):
+        # Chord length between unit vectors -> central angle
+        return np.degrees(2 * np.arcsin(np.clip(embedded / 2, 0.0, 1.0)))
+
+
+class AngularMetric(StandardizedMetric):
+    """Great-circle sky position combined with z-scored magnitudes and redshift.
+
+    The sky unit vectors are scaled so their total variance equals that of
+    the two standardized columns (alpha, delta) they replace.
+    """
+
+    name = "angular"
+    label = "Standardized + great-circle sky"
+    terms = ["sky", "sky", "sky"] + FEATURE_COLUMNS[2:]
+
+    def fit(self, features):
+        super().fit(features[:, 2:])
+        sky = _sky_vectors(features[:, 0], features[:, 1])
+        self.sky_scale = np.sqrt(sky.var(axis=0).sum() / 2) or 1.0
+        return self
+
+    def embed(self, features):
+        sky = _sky_vectors(features[:, 0], features[:, 1]) / self.sky_scale
+        return np.hstack([sky, (features[:, 2:] - self.mean) / self.std])
+
+
+METRICS = {metric.name: metric for metric in [AngularMetric, StandardizedMetric, SkyMetric, EuclideanMetric]}
+
+
+def weight_terms(metric_name):
+    """Distinct weightable terms of a metric, in embedding order."""
+    metric = METRICS[metric_name]
+    if not metric.weighted:
+        return []
+    return list(dict.fromkeys(metric.terms))
+
+
+class NeighborIndex:
+    """Exact k-nearest-neighbour search over one class of objects.
+
+    The metric embedding is computed once as a contiguous float32 matrix and
+    scanned in blocks with NumPy; each block keeps only its k best rows via
+    argpartition, so a query never sorts the whole subset. Weights are
+    applied at query time and do not require rebuilding the index.
+    """
+
+    def __init__(self, frame, metric):
+        self.metric = metric
+        self.labels = frame.index.to_numpy()
+        self.points = metric.transform(frame[FEATURE_COLUMNS].to_numpy(dtype=np.float64))
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _scale(self, weights):
+        if not weights or not self.metric.weighted:
+            return None
+        return np.sqrt([weights.get(term, 1.0) for term in self.metric.terms]).astype(np.float32)
+
+    def query(self, point, k=10, weights=None):
+        """Return (index labels, distances) of the ``k`` rows closest to ``point``.
+
+        ``point`` holds raw values in FEATURE_COLUMNS order; ``weights`` maps
+        metric terms to multipliers of their squared differences.
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return self.labels[:0], np.empty(0)
+        point = self.metric.transform(point)[0]
+        scale = self._scale(weights)
+
+        best_positions = []
+        best_distances = []
+        for start in range(0, len(self), BLOCK_SIZE):
+            diff = self.points[start:start + BLOCK_SIZE] - point
+            if scale is not None:
+                diff *= scale
+            squared = np.einsum("ij,ij->i", diff, diff)
+            if len(squared) > k:
+                top = np.argpartition(squared, k - 1)[:k]
+            else:
+                top = np.arange(len(squared))
+            best_positions.append(top + start)
+            best_distances.append(squared[top])
+
+        positions = np.concatenate(best_positions)
+        squared = np.concatenate(best_distances)
+        order = np.argsort(squared, kind="stable")[:k]
+        positions = positions[order]
+
+        # Recompute only the k winning distances in float64 for display
+        diff = self.points[positions].astype(np.float64) - point.astype(np.float64)
+        if scale is not None:
+            diff *= scale
+        distances = np.sqrt(np.einsum("ij,ij->i", diff, diff))
+        return self.labels[positions], self.metric.to_distance(distances)
+
+
+def build_indexes(data, metric="euclidean", class_column="class"):
+    """Fit ``metric`` on all of ``data`` and build one NeighborIndex per class label."""
+    fitted = METRICS[metric]().fit(data[FEATURE_COLUMNS].to_numpy(dtype=np.float64))
+    return {
+        label: NeighborIndex(group, fitted)
+        for label, group in data.groupby(class_column, observed=True)
+    }
@@ -1,11 +1,16 @@
+import os
+import tempfile
+
 import streamlit as st
-import pandas as pd
-import joblib
+
+import batch_predict
+import inference
+import model_registry
 
 def main():
     # Load the trained model
     try:
-        model = joblib.load("CatBoost_adv_stars_class.pkl")
+        model = model_registry.get_model()
     except Exception as e:
         st.error(f"Error loading model: {e}")
         return  # Exit if model cannot be loaded
@@ -13,6 +18,15 @@ def main():
     # Title of the web app
     st.title("Star Classification App")
 
+    info = model_registry.model_info()
+    memory_note = ""
+    if info["memory_bytes"] is not None:
+        memory_note = f", ~{info['memory_bytes'] / 1e6:.1f} MB resident"
+    st.caption(
+        f"Model `{os.path.basename(info['path'])}` loaded once per process in {info['load_seconds'] * 1000:.0f} ms "
+        f"(warm-up {info['warmup_seconds'] * 1000:.0f} ms{memory_note})"
+    )
+
     # Custom CSS for styling
     st.markdown("""
         <style>
@@ -87,19 +101,22 @@ def main():
             'MJD': MJD
         }
 
-        features = pd.DataFrame(data, index=[0])
-        return features
+        return data
 
     # Get user input
-    input_df = user_input_features()
+    input_features = user_input_features()
+
+    # Objects below this confidence are routed to spectroscopic follow-up instead
+    st.sidebar.header("Confidence")
+    threshold = st.sidebar.slider("Minimum confidence", 0.0, 1.0, 0.5, 0.05)
 
     # Display user input
     st.subheader('User Input Features')
-    st.write(input_df)
+    st.dataframe([input_features])
 
-    # Make prediction with error handling
+    # Make prediction with error handling; repeated inputs are served from the prediction cache
     try:
-        prediction = model.predict(input_df)
+        prediction = inference.predict_one(input_features, threshold=threshold)
     except Exception as e:
         st.error(f"Error making prediction: {e}")
     else:
@@ -108,14 +125,26 @@ def main():
 
         # Customize the prediction message
         prediction_message = ""
-        if prediction[0] == 'GALAXY':
+        if prediction["label"] == 'GALAXY':
             prediction_message = "🌌 It's a `Galaxy`"
-        elif prediction[0] == 'QSO':
+        elif prediction["label"] == 'QSO':
             prediction_message = "🛰️🔭 It's a `QSO`"
         else:
             prediction_message = "⭐ It's a `Star`"
 
         st.markdown(f"<div class='prediction-box'>{prediction_message}</div>", unsafe_allow_html=True)
+        st.write(" · ".join(f"**{label}:** {probability:.1%}" for label, probability in prediction["probabilities"].items()))
+        if prediction["abstain"]:
+            st.warning(
+                f"Low confidence ({prediction['confidence']:.1%} < {threshold:.0%}): "
+                "this object is a candidate for spectroscopic follow-up."
+            )
+
+        cache_stats = inference.get_prediction_cache().stats()
+        st.caption(
+            f"Prediction cache: {cache_stats['hits']:,} hits, {cache_stats['misses']:,} misses "
+            f"({cache_stats['hit_rate']:.0%} hit rate, {cache_stats['size']:,} of {cache_stats['maxsize']:,} entries)"
+        )
 
         # Add more details or a description below the result
         st.markdown("""
@@ -124,6 +153,39 @@ def main():
         </div>
         """, unsafe_allow_html=True)
 
+    # Batch classification of a whole SDSS export
+    st.subheader('Batch Classification')
+    st.write(
+        "Upload a CSV with the columns alpha, delta, u, g, r, i, z, redshift, plate and MJD to classify every row. "
+        "Rows below the minimum confidence are marked in the follow_up column."
+    )
+    uploaded_file = st.file_uploader("Upload CSV", type=["csv"])
+    if uploaded_file is not None and st.button("Classify File"):
+        progress_text = st.empty()
+        with tempfile.TemporaryFile(mode="w+", suffix=".csv", newline="") as scored_file:
+            try:
+                stats = batch_predict.score_csv(
+                    uploaded_file,
+                    scored_file,
+                    model=model,
+                    threshold=threshold,
+                    progress=lambda rows: progress_text.write(f"Scored {rows:,} rows...")
+                )
+            except Exception as e:
+                st.error(f"Error scoring file: {e}")
+            else:
+                progress_text.write(
+                    f"Scored {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+                    f"({stats['rows_per_second']:,.0f} rows/s), {stats['follow_up']:,} flagged for follow-up"
+                )
+                scored_file.seek(0)
+                st.download_button(
+                    "Download Predictions",
+                    data=scored_file.read(),
+                    file_name="predictions.csv",
+                    mime="text/csv"
+                )
+
 # Run the main function
 if __name__ == "__main__":
     main()
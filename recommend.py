@@ -1,8 +1,11 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-import numpy as np
-import seaborn as sns
+
+import data_loader
+import instrumentation
+import neighbors
+
+RECOMMEND_COLUMNS = ["obj_ID", "class"] + neighbors.FEATURE_COLUMNS
 
 # Custom CSS for styling
 st.markdown("""
@@ -37,24 +40,32 @@ def main():
     st.title("Star Recommendation System")
     st.write("Use this tool to find stars similar to your selected star type based on various parameters.")
 
-    # Load dataset
-    @st.cache
-    def load_data():
-        try:
-            return pd.read_csv("star_classification.csv")
-        except Exception as e:
-            st.error(f"Error loading data: {e}")
-            return pd.DataFrame()  # Return empty DataFrame in case of error
-
-    data = load_data()
+    # Load only the columns this page uses (shared across pages and sessions, see data_loader)
+    data = data_loader.load_data(columns=RECOMMEND_COLUMNS)
 
     if data.empty:
         st.stop()
 
+    # Per-class neighbour indexes, built once per metric and shared across reruns and sessions
+    @st.cache_resource
+    def load_indexes(metric):
+        return neighbors.build_indexes(data_loader.load_data(columns=RECOMMEND_COLUMNS), metric=metric)
+
     # Sidebar: Recommendation Inputs
     st.sidebar.header("Recommendation Inputs")
     
     star_type = st.sidebar.selectbox("Select a Star Type", ["Galaxy", "QSO", "Star"])
+    num_recommendations = st.sidebar.number_input("Number of Recommendations", min_value=1, max_value=100, value=10)
+    metric = st.sidebar.selectbox(
+        "Distance Metric",
+        list(neighbors.METRICS),
+        format_func=lambda name: neighbors.METRICS[name].label
+    )
+    weights = {}
+    if neighbors.weight_terms(metric):
+        with st.sidebar.expander("Feature Weights"):
+            for term in neighbors.weight_terms(metric):
+                weights[term] = st.slider(f"Weight: {term}", 0.0, 5.0, 1.0, 0.1, key=f"weight_{term}")
 
     # Place the button at the top of the sidebar
     find_similar_stars = st.sidebar.button("Find Similar Stars")
@@ -70,155 +81,158 @@ def main():
     redshift = st.sidebar.slider("Redshift", 0.0, 10.0, 0.5)
 
     if find_similar_stars:
-        # Filter the dataset based on star type
-        filtered_data = data[data["class"] == star_type]
-        
-        if filtered_data.empty:
+        # The dataset labels classes as GALAXY, QSO and STAR
+        with instrumentation.section("neighbour index"):
+            index = load_indexes(metric).get(star_type.upper())
+
+        if index is None or len(index) == 0:
             st.error("No data available for the selected star type.")
         else:
             # Find similar stars based on feature proximity
-            def calculate_distance(row):
-                return np.sqrt(
-                    (row["alpha"] - alpha)**2 + 
-                    (row["delta"] - delta)**2 + 
-                    (row["u"] - u)**2 + 
-                    (row["g"] - g)**2 + 
-                    (row["r"] - r)**2 + 
-                    (row["i"] - i)**2 + 
-                    (row["z"] - z)**2 + 
-                    (row["redshift"] - redshift)**2
-                )
-
-            filtered_data["distance"] = filtered_data.apply(calculate_distance, axis=1)
-            recommendations = filtered_data.sort_values(by="distance").head(10)
+            with instrumentation.section("neighbour search"):
+                labels, distances = index.query([alpha, delta, u, g, r, i, z, redshift], k=num_recommendations, weights=weights)
+            recommendations = data.loc[labels].assign(distance=distances)
 
             # Display recommendations
             st.subheader("Recommended Similar Stars")
-            st.write("Here are the top 10 stars similar to your input:")
+            st.write(f"Here are the top {len(recommendations)} stars similar to your input:")
             
             # Display data in a table
             st.dataframe(recommendations[["obj_ID", "alpha", "delta", "u", "g", "r", "i", "z", "redshift", "distance"]])
             
             # Distance Distribution
             st.write("Distance distribution of recommended stars:")
-            distance_fig = px.histogram(recommendations, x="distance", nbins=20, title="Distance Distribution of Recommended Stars")
-            st.plotly_chart(distance_fig)
+            with instrumentation.section("chart: distance distribution"):
+                distance_fig = px.histogram(recommendations, x="distance", nbins=20, title="Distance Distribution of Recommended Stars")
+                instrumentation.plotly_chart(distance_fig)
 
             # Interactive 3D Scatter Plots
             st.write("3D scatter plots of selected features:")
             
             # Plot 1: alpha, delta, u
-            scatter_3d_alpha_delta_u = px.scatter_3d(
-                recommendations,
-                x="alpha",
-                y="delta",
-                z="u",
-                color="distance",
-                title="3D Scatter Plot: Alpha vs Delta vs u",
-                labels={"alpha": "Alpha", "delta": "Delta", "u": "u", "distance": "Distance"}
-            )
-            st.plotly_chart(scatter_3d_alpha_delta_u)
+            with instrumentation.section("chart: 3D scatter alpha, delta, u"):
+                scatter_3d_alpha_delta_u = px.scatter_3d(
+                    recommendations,
+                    x="alpha",
+                    y="delta",
+                    z="u",
+                    color="distance",
+                    title="3D Scatter Plot: Alpha vs Delta vs u",
+                    labels={"alpha": "Alpha", "delta": "Delta", "u": "u", "distance": "Distance"}
+                )
+                instrumentation.plotly_chart(scatter_3d_alpha_delta_u)
             
             # Plot 2: g, r, i
-            scatter_3d_gri = px.scatter_3d(
-                recommendations,
-                x="g",
-                y="r",
-                z="i",
-                color="distance",
-                title="3D Scatter Plot: g vs r vs i",
-                labels={"g": "g", "r": "r", "i": "i", "distance": "Distance"}
-            )
-            st.plotly_chart(scatter_3d_gri)
+            with instrumentation.section("chart: 3D scatter g, r, i"):
+                scatter_3d_gri = px.scatter_3d(
+                    recommendations,
+                    x="g",
+                    y="r",
+                    z="i",
+                    color="distance",
+                    title="3D Scatter Plot: g vs r vs i",
+                    labels={"g": "g", "r": "r", "i": "i", "distance": "Distance"}
+                )
+                instrumentation.plotly_chart(scatter_3d_gri)
             
             # Plot 3: z, redshift, distance
-            scatter_3d_z_redshift_distance = px.scatter_3d(
-                recommendations,
-                x="z",
-                y="redshift",
-                z="distance",
-                color="distance",
-                title="3D Scatter Plot: z vs Redshift vs Distance",
-                labels={"z": "z", "redshift": "Redshift", "distance": "Distance"}
-            )
-            st.plotly_chart(scatter_3d_z_redshift_distance)
+            with instrumentation.section("chart: 3D scatter z, redshift, distance"):
+                scatter_3d_z_redshift_distance = px.scatter_3d(
+                    recommendations,
+                    x="z",
+                    y="redshift",
+                    z="distance",
+                    color="distance",
+                    title="3D Scatter Plot: z vs Redshift vs Distance",
+                    labels={"z": "z", "redshift": "Redshift", "distance": "Distance"}
+                )
+                instrumentation.plotly_chart(scatter_3d_z_redshift_distance)
             
             # Plot 4: alpha, g, r
-            scatter_3d_alpha_g_r = px.scatter_3d(
-                recommendations,
-                x="alpha",
-                y="g",
-                z="r",
-                color="distance",
-                title="3D Scatter Plot: Alpha vs g vs r",
-                labels={"alpha": "Alpha", "g": "g", "r": "r", "distance": "Distance"}
-            )
-            st.plotly_chart(scatter_3d_alpha_g_r)
+            with instrumentation.section("chart: 3D scatter alpha, g, r"):
+                scatter_3d_alpha_g_r = px.scatter_3d(
+                    recommendations,
+                    x="alpha",
+                    y="g",
+                    z="r",
+                    color="distance",
+                    title="3D Scatter Plot: Alpha vs g vs r",
+                    labels={"alpha": "Alpha", "g": "g", "r": "r", "distance": "Distance"}
+                )
+                instrumentation.plotly_chart(scatter_3d_alpha_g_r)
             
             # Plot 5: delta, i, z
-            scatter_3d_delta_i_z = px.scatter_3d(
-                recommendations,
-                x="delta",
-                y="i",
-                z="z",
-                color="distance",
-                title="3D Scatter Plot: Delta vs i vs z",
-                labels={"delta": "Delta", "i": "i", "z": "z", "distance": "Distance"}
-            )
-            st.plotly_chart(scatter_3d_delta_i_z)
+            with instrumentation.section("chart: 3D scatter delta, i, z"):
+                scatter_3d_delta_i_z = px.scatter_3d(
+                    recommendations,
+                    x="delta",
+                    y="i",
+                    z="z",
+                    color="distance",
+                    title="3D Scatter Plot: Delta vs i vs z",
+                    labels={"delta": "Delta", "i": "i", "z": "z", "distance": "Distance"}
+                )
+                instrumentation.plotly_chart(scatter_3d_delta_i_z)
             
             # Plot 6: u, r, redshift
-            scatter_3d_u_r_redshift = px.scatter_3d(
-                recommendations,
-                x="u",
-                y="r",
-                z="redshift",
-                color="distance",
-                title="3D Scatter Plot: u vs r vs Redshift",
-                labels={"u": "u", "r": "r", "redshift": "Redshift", "distance": "Distance"}
-            )
-            st.plotly_chart(scatter_3d_u_r_redshift)
+            with instrumentation.section("chart: 3D scatter u, r, redshift"):
+                scatter_3d_u_r_redshift = px.scatter_3d(
+                    recommendations,
+                    x="u",
+                    y="r",
+                    z="redshift",
+                    color="distance",
+                    title="3D Scatter Plot: u vs r vs Redshift",
+                    labels={"u": "u", "r": "r", "redshift": "Redshift", "distance": "Distance"}
+                )
+                instrumentation.plotly_chart(scatter_3d_u_r_redshift)
             
             # Plot 7: alpha, delta, redshift
-            scatter_3d_alpha_delta_redshift = px.scatter_3d(
-                recommendations,
-                x="alpha",
-                y="delta",
-                z="redshift",
-                color="distance",
-                title="3D Scatter Plot: Alpha vs Delta vs Redshift",
-                labels={"alpha": "Alpha", "delta": "Delta", "redshift": "Redshift", "distance": "Distance"}
-            )
-            st.plotly_chart(scatter_3d_alpha_delta_redshift)
+            with instrumentation.section("chart: 3D scatter alpha, delta, redshift"):
+                scatter_3d_alpha_delta_redshift = px.scatter_3d(
+                    recommendations,
+                    x="alpha",
+                    y="delta",
+                    z="redshift",
+                    color="distance",
+                    title="3D Scatter Plot: Alpha vs Delta vs Redshift",
+                    labels={"alpha": "Alpha", "delta": "Delta", "redshift": "Redshift", "distance": "Distance"}
+                )
+                instrumentation.plotly_chart(scatter_3d_alpha_delta_redshift)
 
             # Plot 8: u, g, i
-            scatter_3d_u_g_i = px.scatter_3d(
-                recommendations,
-                x="u",
-                y="g",
-                z="i",
-                color="distance",
-                title="3D Scatter Plot: u vs g vs i",
-                labels={"u": "u", "g": "g", "i": "i", "distance": "Distance"}
-            )
-            st.plotly_chart(scatter_3d_u_g_i)
-
-            # Pair Plot of Features
+            with instrumentation.section("chart: 3D scatter u, g, i"):
+                scatter_3d_u_g_i = px.scatter_3d(
+                    recommendations,
+                    x="u",
+                    y="g",
+                    z="i",
+                    color="distance",
+                    title="3D Scatter Plot: u vs g vs i",
+                    labels={"u": "u", "g": "g", "i": "i", "distance": "Distance"}
+                )
+                instrumentation.plotly_chart(scatter_3d_u_g_i)
+
+            # Pair Plot of Features (seaborn takes ~2s to import, so load it only here)
             st.write("Pair plot of the features of recommended stars:")
-            pair_plot_fig = sns.pairplot(recommendations[["alpha", "delta", "u", "g", "r", "i", "z", "redshift"]])
-            st.pyplot(pair_plot_fig)
+            with instrumentation.section("chart: pair plot"):
+                import seaborn as sns
+                pair_plot_fig = sns.pairplot(recommendations[["alpha", "delta", "u", "g", "r", "i", "z", "redshift"]])
+                st.pyplot(pair_plot_fig)
             
             # Feature Correlation Heatmap
             st.write("Feature correlation heatmap of recommended stars:")
-            correlation_matrix = recommendations[["alpha", "delta", "u", "g", "r", "i", "z", "redshift"]].corr()
-            heatmap_fig = px.imshow(correlation_matrix, text_auto=True, title="Feature Correlation Heatmap")
-            st.plotly_chart(heatmap_fig)
+            with instrumentation.section("chart: correlation heatmap"):
+                correlation_matrix = recommendations[["alpha", "delta", "u", "g", "r", "i", "z", "redshift"]].corr()
+                heatmap_fig = px.imshow(correlation_matrix, text_auto=True, title="Feature Correlation Heatmap")
+                instrumentation.plotly_chart(heatmap_fig)
             
             # Star Type Distribution
             st.write("Distribution of Star Types in the Dataset:")
-            star_type_dist = data["class"].value_counts()
-            pie_chart_fig = px.pie(values=star_type_dist.values, names=star_type_dist.index, title="Distribution of Star Types")
-            st.plotly_chart(pie_chart_fig)
+            with instrumentation.section("chart: star type distribution"):
+                star_type_dist = data["class"].value_counts()
+                pie_chart_fig = px.pie(values=star_type_dist.values, names=star_type_dist.index, title="Distribution of Star Types")
+                instrumentation.plotly_chart(pie_chart_fig)
             
 
 
@@ -0,0 +1,213 @@
+"""Headless HTTP inference service for the star classification model.
+
+Usage:
+    python serve.py [--host 127.0.0.1] [--port 8000] [--max-batch 512] [--max-wait-ms 2]
+                    [--threshold 0.9] [--margin 0.2]
+
+POST /predict accepts one record or a list of records (optionally wrapped as
+{"records": [...]}) with the same ten fields as the Predict page and returns
+the predicted class, its confidence and per-class probabilities for each
+record. The wrapped form may also carry "threshold" and "margin" to override
+the server's abstain rule; records the rule abstains on are marked
+"abstain": true.
+GET /health reports the model load statistics.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import inference
+import model_registry
+
+
+class MicroBatcher:
+    """Coalesce concurrent requests into a single predict_proba call.
+
+    A worker thread takes the first pending request, then keeps collecting
+    requests until ``max_batch`` records are queued or ``max_wait`` seconds
+    have passed, scores them together and resolves each request's future.
+    Rows travel as NumPy arrays in model column order; building a DataFrame
+    per request costs more than the model call itself.
+    """
+
+    def __init__(self, model, max_batch=512, max_wait=0.002):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, rows):
+        """Queue a 2-D feature array and return a Future of its class probabilities."""
+        future = Future()
+        self._queue.put((rows, future))
+        return future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        size = len(batch[0][0])
+        # One window per batch, so a steady stream of requests cannot keep extending it
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                probabilities = self.model.predict_proba(np.concatenate([rows for rows, _ in batch]))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            offset = 0
+            for rows, future in batch:
+                future.set_result(probabilities[offset:offset + len(rows)])
+                offset += len(rows)
+
+
+def parse_records(payload):
+    """Validate a JSON payload and return it as a float array in model column order."""
+    if isinstance(payload, dict):
+        payload = payload.get("records", [payload])
+    if not isinstance(payload, list) or not payload:
+        raise ValueError("Expected a record or a non-empty list of records")
+    rows = []
+    for position, record in enumerate(payload):
+        if not isinstance(record, dict):
+            raise ValueError(f"Record {position} is not an object")
+        missing = [column for column in model_registry.FEATURE_COLUMNS if column not in record]
+        if missing:
+            raise ValueError(f"Record {position} is missing: {', '.join(missing)}")
+        try:
+            rows.append([float(record[column]) for column in model_registry.FEATURE_COLUMNS])
+        except (TypeError, ValueError):
+            raise ValueError(f"Record {position} has a non-numeric feature")
+        if not all(np.isfinite(rows[-1])):
+            raise ValueError(f"Record {position} has a NaN or infinite feature")
+    return np.array(rows, dtype=np.float64)
+
+
+def parse_rule(payload, threshold=None, margin=None):
+    """Abstain rule of a request: its "threshold" and "margin", defaulting to the server's."""
+    if isinstance(payload, dict) and "records" in payload:
+        threshold = payload.get("threshold", threshold)
+        margin = payload.get("margin", margin)
+    for name, value in (("threshold", threshold), ("margin", margin)):
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 1):
+            raise ValueError(f"{name} must be a number between 0 and 1")
+    return threshold, margin
+
+
+def format_predictions(classes, probabilities, threshold=None, margin=None):
+    """Turn class probabilities into JSON-serialisable prediction dicts."""
+    classes = [str(label) for label in classes]
+    labels, confidence, abstain = inference.decide(probabilities, classes, threshold, margin)
+    return [
+        {
+            "class": str(label),
+            "confidence": float(row_confidence),
+            "abstain": bool(row_abstain),
+            "probabilities": dict(zip(classes, row.tolist()))
+        }
+        for label, row_confidence, row_abstain, row in zip(labels, confidence, abstain, probabilities)
+    ]
+
+
+class InferenceServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog of 5 drops connections under concurrent load
+    request_queue_size = 1024
+
+
+class InferenceHandler(BaseHTTPRequestHandler):
+    # Keep-alive lets clients reuse connections instead of reconnecting per request
+    protocol_version = "HTTP/1.1"
+    batcher = None
+    timeout_seconds = 30
+    threshold = None
+    margin = None
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "model": model_registry.model_info()})
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length))
+            rows = parse_records(payload)
+            threshold, margin = parse_rule(payload, self.threshold, self.margin)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        try:
+            probabilities = self.batcher.submit(rows).result(timeout=self.timeout_seconds)
+        except Exception as e:
+            self._send_json(500, {"error": f"Error making prediction: {e}"})
+            return
+        predictions = format_predictions(self.batcher.model.classes_, probabilities, threshold, margin)
+        self._send_json(200, {"predictions": predictions})
+
+    def log_message(self, format, *args):
+        # Per-request access logs dominate the cost at high request rates
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve star classifications over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=512, help="Maximum records per model call")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="How long to wait for a batch to fill")
+    parser.add_argument("--threshold", type=float, help="Default minimum top class probability before abstaining")
+    parser.add_argument("--margin", type=float, help="Default minimum lead over the runner-up class before abstaining")
+    args = parser.parse_args()
+
+    # Load and warm up before listening, so the first request does not pay for it
+    try:
+        model = model_registry.get_model()
+    except Exception as e:
+        parser.exit(1, f"Error loading model: {e}\n")
+    info = model_registry.model_info()
+    print(f"Loaded {info['path']} in {info['load_seconds']:.2f}s, warmed up in {info['warmup_seconds']:.2f}s")
+    InferenceHandler.threshold, InferenceHandler.margin = parse_rule(None, args.threshold, args.margin)
+    InferenceHandler.batcher = MicroBatcher(model, max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000)
+    server = InferenceServer((args.host, args.port), InferenceHandler)
+    print(f"Serving predictions on http://{args.host}:{args.port}/predict")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
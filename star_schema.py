@@ -0,0 +1,29 @@
+"""Path and column types of the star classification dataset.
+
+Kept free of Streamlit so offline tools can use them without importing it;
+data_loader re-exports both names.
+"""
+DATA_PATH = "star_classification.csv"
+
+# Compact column types for the SDSS17 export. obj_ID and spec_obj_ID exceed the
+# int32 range (spec_obj_ID exceeds int64 too), the remaining IDs fit in int32.
+DTYPES = {
+    "obj_ID": "int64",
+    "alpha": "float32",
+    "delta": "float32",
+    "u": "float32",
+    "g": "float32",
+    "r": "float32",
+    "i": "float32",
+    "z": "float32",
+    "run_ID": "int32",
+    "rerun_ID": "int32",
+    "cam_col": "int32",
+    "field_ID": "int32",
+    "spec_obj_ID": "uint64",
+    "class": "category",
+    "redshift": "float32",
+    "plate": "int32",
+    "MJD": "int32",
+    "fiber_ID": "int32"
+}
@@ -0,0 +1,127 @@
+"""Import-time profiling for the app's pages and dependency footprint.
+
+Usage:
+    python startup_profile.py [--top 15] [--sizes]
+
+For every page module, runs a fresh interpreter with ``-X importtime`` and
+reports the cold import time plus the heaviest top-level packages it pulls
+in. ``--sizes`` adds the installed size of each distribution listed in
+requirements.txt. Inside the app, pages imported through import_page()
+record their first-import time in IMPORT_TIMES.
+"""
+import argparse
+import importlib
+import importlib.metadata
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Module names of the pages main.py dispatches to
+PAGES = ["predict", "recommend", "visualize", "analyze", "insights", "gallery", "feedback", "about"]
+
+# Seconds spent on the first import of each page module in this process
+IMPORT_TIMES = {}
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_page(name):
+    """Import a page module, recording how long its first import took."""
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_TIMES[name] = time.perf_counter() - start
+    return module
+
+
+def importtime_report(module, python=sys.executable):
+    """Cold-import ``module`` in a fresh interpreter.
+
+    Returns (total seconds, {top-level package: cumulative seconds}), where
+    a package's time includes everything it imported first.
+    """
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"import {module} failed")
+
+    packages = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        if indent == 1 and name == module:
+            total = cumulative
+        top_level = name.split(".")[0]
+        if "." not in name and name != module:
+            packages[top_level] = max(packages.get(top_level, 0), cumulative)
+    return total / 1e6, {name: micros / 1e6 for name, micros in packages.items()}
+
+
+def requirement_names(path="requirements.txt"):
+    """Distribution names listed in a requirements file."""
+    names = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#")[0].strip()
+            if line and not line.startswith("-"):
+                names.append(re.split(r"[<>=!~\[; ]", line)[0])
+    return names
+
+
+def distribution_size(name):
+    """Installed size in bytes of a distribution, or None if it is not installed."""
+    try:
+        distribution = importlib.metadata.distribution(name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+    total = 0
+    for file in distribution.files or []:
+        try:
+            total += os.path.getsize(distribution.locate_file(file))
+        except OSError:
+            pass
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time of each page and dependency sizes.")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest packages to list per page")
+    parser.add_argument("--sizes", action="store_true", help="Report installed size of requirements.txt entries")
+    args = parser.parse_args()
+
+    for page in PAGES:
+        try:
+            total, packages = importtime_report(page)
+        except RuntimeError as e:
+            print(f"{page}: import failed ({e})")
+            continue
+        print(f"{page}: {total:.3f}s cold import")
+        heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        for name, seconds in heaviest:
+            print(f"    {name:<24} {seconds:.3f}s")
+
+    if args.sizes:
+        print("\nInstalled size of requirements.txt:")
+        overall = 0
+        for name in requirement_names(os.path.join(os.path.dirname(os.path.abspath(__file__)), "requirements.txt")):
+            size = distribution_size(name)
+            if size is None:
+                print(f"    {name:<24} not installed")
+            else:
+                overall += size
+                print(f"    {name:<24} {size / 1e6:8.1f} MB")
+        print(f"    {'total':<24} {overall / 1e6:8.1f} MB (excluding transitive dependencies)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Cached aggregate statistics over the shared dataset.
+
+Charts are built from these aggregates instead of raw rows, so their payload
+scales with the number of bins rather than the number of objects.
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+import data_loader
+
+DEFAULT_BINS = 50
+
+# Option used by class filter selectboxes to mean "no filter"
+ALL_CLASSES = "All"
+
+
+def _column_values(column, class_value=None):
+    data = data_loader.load_data()
+    values = data[column]
+    if class_value not in (None, ALL_CLASSES):
+        values = values[data["class"] == class_value]
+    return values
+
+
+def class_options():
+    """Class filter choices for selectboxes, starting with ALL_CLASSES."""
+    data = data_loader.load_data()
+    return [ALL_CLASSES] + [str(label) for label in data["class"].dropna().unique()]
+
+
+@st.cache_data(show_spinner=False)
+def histogram(column, nbins=DEFAULT_BINS, class_value=None, value_range=None):
+    """Return (counts, bin edges) of a numeric column, optionally for one class.
+
+    ``value_range`` fixes the bin range so several histograms can share edges.
+    """
+    values = _column_values(column, class_value).to_numpy(dtype=np.float64)
+    values = values[np.isfinite(values)]
+    if value_range is None and len(values) == 0:
+        value_range = (0.0, 1.0)
+    return np.histogram(values, bins=nbins, range=value_range)
+
+
+@st.cache_data(show_spinner=False)
+def category_counts(column, class_value=None):
+    """Value counts of a non-numeric column, optionally for one class."""
+    return _column_values(column, class_value).value_counts()
+
+
+@st.cache_data(show_spinner=False)
+def column_range(column):
+    """Finite (min, max) of a numeric column."""
+    values = data_loader.load_data()[column].to_numpy(dtype=np.float64)
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return 0.0, 1.0
+    return float(values.min()), float(values.max())
+
+
+def is_numeric(column):
+    return pd.api.types.is_numeric_dtype(data_loader.load_data()[column])
+
+
+def histogram_figure(column, nbins=DEFAULT_BINS, title=None, class_value=None, **bar_kwargs):
+    """Plotly histogram of ``column`` drawn from cached bin counts."""
+    title = title or f"Histogram of {column}"
+    if not is_numeric(column):
+        counts = category_counts(column, class_value)
+        return px.bar(x=counts.index.astype(str), y=counts.values, title=title,
+                      labels={"x": column, "y": "count"}, **bar_kwargs)
+    counts, edges = histogram(column, nbins, class_value)
+    fig = px.bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, title=title,
+                 labels={"x": column, "y": "count"}, **bar_kwargs)
+    fig.update_traces(width=np.diff(edges))
+    fig.update_layout(bargap=0)
+    return fig
+
+
+def multi_histogram_figure(columns, nbins=DEFAULT_BINS, title=None):
+    """Horizontal stacked histograms of several numeric columns on shared bins."""
+    columns = [column for column in columns if is_numeric(column)]
+    ranges = [column_range(column) for column in columns]
+    value_range = (min(low for low, _ in ranges), max(high for _, high in ranges)) if ranges else (0.0, 1.0)
+    frames = []
+    for column in columns:
+        counts, edges = histogram(column, nbins, value_range=value_range)
+        frames.append(pd.DataFrame({"value": (edges[:-1] + edges[1:]) / 2, "count": counts, "variable": column}))
+    long_form = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["value", "count", "variable"])
+    fig = px.bar(long_form, x="count", y="value", color="variable", orientation="h", title=title)
+    if columns:
+        fig.update_traces(width=(value_range[1] - value_range[0]) / nbins)
+    fig.update_layout(bargap=0)
+    return fig
+
+
+def numeric_frame():
+    """The dataset's numeric columns."""
+    return data_loader.load_data().select_dtypes("number")
+
+
+@st.cache_data(show_spinner=False)
+def correlation_matrix():
+    """Pearson correlations between all numeric columns, computed in one pass."""
+    frame = numeric_frame()
+    values = frame.to_numpy(dtype=np.float64)
+    if np.isnan(values).any():
+        # Pairwise-complete correlations need pandas' per-pair masking
+        return frame.corr()
+    centered = values - values.mean(axis=0)
+    scale = np.sqrt((centered ** 2).sum(axis=0))
+    scale[scale == 0] = np.nan
+    normalized = centered / scale
+    return pd.DataFrame(normalized.T @ normalized, index=frame.columns, columns=frame.columns)
+
+
+def correlation(columns):
+    """Correlation matrix restricted to the numeric ``columns``, read from the cached matrix."""
+    matrix = correlation_matrix()
+    columns = [column for column in columns if column in matrix.columns]
+    return matrix.loc[columns, columns]
+
+
+@st.cache_data(show_spinner=False)
+def summary():
+    """describe() statistics plus skewness and excess kurtosis of every numeric column.
+
+    Moments are computed together from one centered matrix, using the same
+    bias-corrected estimators as pandas' skew() and kurtosis().
+    """
+    frame = numeric_frame()
+    values = frame.to_numpy(dtype=np.float64)
+    count = np.sum(~np.isnan(values), axis=0).astype(np.float64)
+    mean = np.nanmean(values, axis=0)
+    centered = values - mean
+    squared = centered ** 2
+    m2 = np.nansum(squared, axis=0) / count
+    m3 = np.nansum(squared * centered, axis=0) / count
+    m4 = np.nansum(squared * squared, axis=0) / count
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std = np.sqrt(m2 * count / (count - 1))
+        skew = np.sqrt(count * (count - 1)) / (count - 2) * m3 / m2 ** 1.5
+        kurtosis = (count - 1) / ((count - 2) * (count - 3)) * ((count + 1) * m4 / m2 ** 2 - 3 * (count - 1))
+    minimum, q1, median, q3, maximum = np.nanpercentile(values, [0, 25, 50, 75, 100], axis=0)
+    return pd.DataFrame(
+        [count, mean, std, minimum, q1, median, q3, maximum, skew, kurtosis],
+        index=["count", "mean", "std", "min", "25%", "50%", "75%", "max", "skew", "kurtosis"],
+        columns=frame.columns
+    )
+
+
+def describe():
+    """Cached equivalent of ``data.describe()``."""
+    return summary().loc[["count", "mean", "std", "min", "25%", "50%", "75%", "max"]]
+
+
+def skewness(columns):
+    columns = [column for column in columns if column in summary().columns]
+    return summary().loc["skew", columns]
+
+
+def kurtosis(columns):
+    columns = [column for column in columns if column in summary().columns]
+    return summary().loc["kurtosis", columns]
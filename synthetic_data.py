@@ -0,0 +1,268 @@
+"""Synthetic datasets shaped like the SDSS17 star classification export.
+
+Usage:
+    python synthetic_data.py rows output.csv|output.parquet [--seed 0] [--chunk-size 1000000]
+
+Tables are generated and written in chunks, so the row count is limited
+by disk space rather than memory. The columns, dtypes and value ranges
+follow star_classification.csv, with the SDSS17 class mix and
+class-dependent redshift and ugriz distributions:
+
+- galaxies: redshift mostly below 1; red colours that redden with redshift
+- QSOs: redshift out to ~7; blue, flat colours
+- stars: redshift near zero; a broad colour sequence
+
+Magnitudes are built from an r-band magnitude plus correlated colours, so
+the five bands are correlated the way real photometry is. IDs are
+bit-packed from run/camcol/field and plate/fiber/MJD as in SDSS. The data
+is good enough to exercise the app, the model and the benchmarks at scale,
+but it is not a substitute for the real survey.
+
+The app and benchmark.py read the CSV; data_loader cannot read Parquet, so
+Parquet output is only for external tools. It uses the same column types
+as data_loader (star_schema.DTYPES).
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+import star_schema
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional; CSV falls back to pandas
+    pa = pacsv = pq = None
+
+# Column order of the SDSS17 export
+COLUMNS = [
+    "obj_ID", "alpha", "delta", "u", "g", "r", "i", "z", "run_ID", "rerun_ID", "cam_col",
+    "field_ID", "spec_obj_ID", "class", "redshift", "plate", "MJD", "fiber_ID"
+]
+
+# Class mix of SDSS17 (59,445 galaxies, 18,961 QSOs, 21,594 stars)
+CLASSES = ["GALAXY", "QSO", "STAR"]
+CLASS_FRACTIONS = [0.59445, 0.18961, 0.21594]
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# Written as float32 like data_loader reads them, which also keeps the CSV compact
+FLOAT_COLUMNS = ["alpha", "delta", "u", "g", "r", "i", "z", "redshift"]
+
+# The schema data_loader reads with, with fixed categories so every Parquet row group shares one
+PARQUET_DTYPES = dict(star_schema.DTYPES, **{"class": pd.CategoricalDtype(CLASSES)})
+
+# Per class: mean r magnitude and its spread, and mean and covariance of the
+# u-g, g-r, r-i and i-z colours at zero redshift
+PHOTOMETRY = {
+    "GALAXY": {
+        "r": (18.9, 0.9),
+        "colour_mean": [1.65, 0.75, 0.38, 0.28],
+        "colour_cov": [[0.20, 0.04, 0.01, 0.00],
+                       [0.04, 0.04, 0.01, 0.00],
+                       [0.01, 0.01, 0.02, 0.005],
+                       [0.00, 0.00, 0.005, 0.02]]
+    },
+    "QSO": {
+        "r": (20.3, 0.9),
+        "colour_mean": [0.35, 0.20, 0.12, 0.08],
+        "colour_cov": [[0.09, 0.02, 0.00, 0.00],
+                       [0.02, 0.04, 0.01, 0.00],
+                       [0.00, 0.01, 0.03, 0.01],
+                       [0.00, 0.00, 0.01, 0.03]]
+    },
+    "STAR": {
+        "r": (18.6, 1.4),
+        "colour_mean": [1.25, 0.55, 0.22, 0.12],
+        "colour_cov": [[0.30, 0.10, 0.05, 0.03],
+                       [0.10, 0.12, 0.06, 0.04],
+                       [0.05, 0.06, 0.08, 0.04],
+                       [0.03, 0.04, 0.04, 0.05]]
+    }
+}
+
+# g-r and r-i reddening per unit redshift for galaxies (the 4000 A break moving through the bands)
+GALAXY_REDDENING = np.array([0.9, 1.1, 0.45, 0.1])
+
+# Ranges of the observation metadata in SDSS17
+RUN_RANGE = (109, 8162)
+FIELD_RANGE = (11, 989)
+PLATE_RANGE = (266, 12547)
+MJD_RANGE = (51608, 58932)
+FIBER_RANGE = (1, 1000)
+DELTA_RANGE = (-18.8, 83.0)
+RERUN = 301
+
+
+def _redshift(label, rows, rng):
+    if label == "GALAXY":
+        return np.clip(rng.gamma(3.0, 0.14, rows), 0.0, 1.99)
+    if label == "QSO":
+        return np.clip(rng.lognormal(np.log(1.5), 0.5, rows), 0.05, 7.0)
+    return rng.normal(0.0, 0.0004, rows)
+
+
+def _photometry(label, redshift, rng):
+    params = PHOTOMETRY[label]
+    rows = len(redshift)
+    r = rng.normal(*params["r"], rows)
+    colours = rng.multivariate_normal(params["colour_mean"], params["colour_cov"], rows)
+    if label == "GALAXY":
+        colours += np.outer(np.minimum(redshift, 0.8), GALAXY_REDDENING)
+        r += 2.5 * np.log10(1 + 4 * redshift)
+    elif label == "QSO":
+        # Lyman-alpha forest drops out of u and then g at high redshift
+        colours[:, 0] += 2.0 * np.clip(redshift - 2.2, 0, None)
+        colours[:, 1] += 1.2 * np.clip(redshift - 3.5, 0, None)
+    u_g, g_r, r_i, i_z = colours.T
+    g = r + g_r
+    i = r - r_i
+    return {"u": g + u_g, "g": g, "r": r, "i": i, "z": i - i_z}
+
+
+def generate_chunk(rows, rng):
+    """DataFrame of ``rows`` synthetic objects drawn with ``rng``."""
+    labels = rng.choice(len(CLASSES), rows, p=CLASS_FRACTIONS)
+    redshift = np.empty(rows)
+    bands = {band: np.empty(rows) for band in "ugriz"}
+    for index, label in enumerate(CLASSES):
+        members = labels == index
+        redshift[members] = _redshift(label, members.sum(), rng)
+        for band, values in _photometry(label, redshift[members], rng).items():
+            bands[band][members] = values
+
+    # Uniform over the survey footprint on the sphere, not in declination
+    sin_delta = rng.uniform(*np.sin(np.radians(DELTA_RANGE)), rows)
+
+    run = rng.integers(RUN_RANGE[0], RUN_RANGE[1] + 1, rows)
+    cam_col = rng.integers(1, 7, rows)
+    field = rng.integers(FIELD_RANGE[0], FIELD_RANGE[1] + 1, rows)
+    plate = rng.integers(PLATE_RANGE[0], PLATE_RANGE[1] + 1, rows)
+    # Plates were observed roughly in numbering order
+    progress = (plate - PLATE_RANGE[0]) / (PLATE_RANGE[1] - PLATE_RANGE[0])
+    mjd = np.clip(
+        MJD_RANGE[0] + progress * (MJD_RANGE[1] - MJD_RANGE[0]) + rng.normal(0, 150, rows),
+        *MJD_RANGE
+    ).astype(np.int64)
+    fiber = rng.integers(FIBER_RANGE[0], FIBER_RANGE[1] + 1, rows)
+
+    # SDSS bit layouts: objID packs sky version, rerun, run, camcol, field and
+    # object number; specObjID packs plate, fiber, MJD and the run2d tag
+    obj_id = (
+        (np.int64(2) << 59) | (np.int64(RERUN) << 48) | (run.astype(np.int64) << 32)
+        | (cam_col.astype(np.int64) << 29) | (field.astype(np.int64) << 16) | rng.integers(1, 1 << 12, rows)
+    )
+    spec_obj_id = (
+        (plate.astype(np.uint64) << np.uint64(50)) | (fiber.astype(np.uint64) << np.uint64(38))
+        | ((mjd - 50000).astype(np.uint64) << np.uint64(24)) | (np.uint64(26) << np.uint64(10))
+    )
+
+    return pd.DataFrame({
+        "obj_ID": obj_id,
+        "alpha": rng.uniform(0, 360, rows),
+        "delta": np.degrees(np.arcsin(sin_delta)),
+        **bands,
+        "run_ID": run,
+        "rerun_ID": np.full(rows, RERUN),
+        "cam_col": cam_col,
+        "field_ID": field,
+        "spec_obj_ID": spec_obj_id,
+        "class": np.asarray(CLASSES)[labels],
+        "redshift": redshift,
+        "plate": plate,
+        "MJD": mjd,
+        "fiber_ID": fiber
+    })[COLUMNS]
+
+
+def iter_chunks(rows, seed=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield DataFrames of at most ``chunk_size`` rows, ``rows`` in total.
+
+    Chunk ``n`` is drawn from its own generator seeded with (seed, n), so the
+    output is reproducible for a given seed and chunk size.
+    """
+    for index, start in enumerate(range(0, rows, chunk_size)):
+        yield generate_chunk(min(chunk_size, rows - start), np.random.default_rng([seed, index]))
+
+
+def generate(rows, seed=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """DataFrame of ``rows`` synthetic objects; use write_csv/write_parquet for large tables."""
+    return pd.concat(iter_chunks(rows, seed, chunk_size), ignore_index=True)
+
+
+def write_csv(path, rows, seed=0, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Stream ``rows`` synthetic objects to the CSV ``path`` one chunk at a time.
+
+    ``progress`` is called with the running row count after each chunk.
+    """
+    written = 0
+    if pacsv is None:
+        with open(path, "w", newline="") as f:
+            for chunk in iter_chunks(rows, seed, chunk_size):
+                # Seven significant digits match float32 and the precision of the SDSS export
+                chunk.to_csv(f, header=written == 0, index=False, float_format="%.7g")
+                written += len(chunk)
+                if progress is not None:
+                    progress(written)
+        return
+
+    # Arrow's CSV writer is about ten times faster than DataFrame.to_csv
+    with open(path, "wb") as f:
+        f.write((",".join(COLUMNS) + "\n").encode("ascii"))
+        writer = None
+        for chunk in iter_chunks(rows, seed, chunk_size):
+            table = pa.Table.from_pandas(chunk.astype({column: "float32" for column in FLOAT_COLUMNS}), preserve_index=False)
+            if writer is None:
+                options = pacsv.WriteOptions(include_header=False, quoting_style="none")
+                writer = pacsv.CSVWriter(f, table.schema, write_options=options)
+            writer.write_table(table)
+            written += len(chunk)
+            if progress is not None:
+                progress(written)
+        if writer is not None:
+            writer.close()
+
+
+def write_parquet(path, rows, seed=0, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Stream ``rows`` synthetic objects to the Parquet ``path``, one row group per chunk.
+
+    Columns are cast to star_schema.DTYPES.
+    """
+    if pq is None:
+        raise RuntimeError("Writing Parquet requires pyarrow")
+    written = 0
+    writer = None
+    try:
+        for chunk in iter_chunks(rows, seed, chunk_size):
+            table = pa.Table.from_pandas(chunk.astype(PARQUET_DTYPES), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            written += len(chunk)
+            if progress is not None:
+                progress(written)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic SDSS17-shaped table in chunks.")
+    parser.add_argument("rows", type=int, help="Number of objects")
+    parser.add_argument("output", help="Destination .csv or .parquet file")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows generated and written at a time")
+    args = parser.parse_args()
+
+    write = write_parquet if os.path.splitext(args.output)[1].lower() == ".parquet" else write_csv
+    write(
+        args.output, args.rows, args.seed, args.chunk_size,
+        progress=lambda written: print(f"Wrote {written:,} of {args.rows:,} rows", flush=True)
+    )
+
+
+if __name__ == "__main__":
+    main()
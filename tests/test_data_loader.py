@@ -0,0 +1,58 @@
+import errno
+import json
+
+import pandas as pd
+import pytest
+
+import data_loader
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "star_classification.csv"
+    pd.DataFrame({
+        "alpha": [1.5, 2.5, 3.5],
+        "redshift": [0.1, 1.2, 0.0],
+        "class": ["GALAXY", "QSO", "STAR"]
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def test_corrupt_meta_file_is_rebuilt(csv_path, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    data_loader.read_star_data(csv_path, cache_dir=cache_dir)
+    _, meta_path = data_loader._cache_paths(csv_path, cache_dir)
+    with open(meta_path, "w") as f:
+        f.write('{"mtime_ns": 12')
+
+    data = data_loader.read_star_data(csv_path, cache_dir=cache_dir)
+
+    assert data["class"].tolist() == ["GALAXY", "QSO", "STAR"]
+    with open(meta_path) as f:
+        assert "sha256" in json.load(f)
+
+
+def test_non_object_meta_file_is_rebuilt(csv_path, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    data_loader.read_star_data(csv_path, cache_dir=cache_dir)
+    _, meta_path = data_loader._cache_paths(csv_path, cache_dir)
+    with open(meta_path, "w") as f:
+        f.write("[]")
+
+    data = data_loader.read_star_data(csv_path, columns=["redshift"], cache_dir=cache_dir)
+
+    assert list(data.columns) == ["redshift"]
+
+
+def test_read_only_cache_falls_back_to_csv(csv_path, tmp_path, monkeypatch):
+    def read_only(target, write):
+        raise OSError(errno.EROFS, "Read-only file system", target)
+
+    monkeypatch.setattr(data_loader, "_write_atomic", read_only)
+
+    data = data_loader.read_star_data(csv_path, cache_dir=str(tmp_path / "cache"))
+
+    assert len(data) == 3
+    assert str(data["class"].dtype) == "category"
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_loader
+import downsample
+
+
+@pytest.fixture
+def data(monkeypatch):
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "alpha": rng.uniform(0, 360, 10_000).astype(np.float32),
+        "redshift": rng.gamma(2.0, 0.2, 10_000).astype(np.float32),
+        "class": pd.Categorical(rng.choice(["GALAXY", "QSO", "STAR"], 10_000))
+    })
+    monkeypatch.setattr(data_loader, "load_data", lambda *args, **kwargs: frame)
+    for function in (downsample.sample_points, downsample.line_points, downsample.density_grid):
+        function.clear()
+    return frame
+
+
+def test_line_points_with_categorical_column(data):
+    points = downsample.line_points(["alpha", "class"], budget=300)
+    assert list(points.columns) == ["alpha", "class"]
+    assert 0 < len(points) <= 300
+    assert points.index.is_monotonic_increasing
+    assert set(points["class"]) == {"GALAXY", "QSO", "STAR"}
+
+
+def test_line_points_with_only_categorical_column(data):
+    points = downsample.line_points(["class"], budget=300)
+    assert 0 < len(points) <= 310
+    assert set(points["class"]) == {"GALAXY", "QSO", "STAR"}
+
+
+def test_density_figure_falls_back_to_scatter_for_categorical_column(data):
+    figure = downsample.density_figure("class", "redshift", "Density")
+    assert figure.data[0].type.startswith("scatter")
+    assert len(figure.data[0].x) <= downsample.SCATTER_BUDGET
+
+
+def test_density_figure_numeric_columns(data):
+    figure = downsample.density_figure("alpha", "redshift", "Density", bins=20)
+    assert figure.data[0].type == "heatmap"
+    assert np.asarray(figure.data[0].z).shape == (20, 20)
@@ -0,0 +1,40 @@
+import contextlib
+import sqlite3
+import time
+
+import feedback_store
+
+
+def rows(path, table):
+    with contextlib.closing(sqlite3.connect(path)) as connection:
+        return connection.execute(f"SELECT * FROM {table}").fetchall()
+
+
+def test_bad_row_is_set_aside_and_writer_survives(tmp_path):
+    path = str(tmp_path / "feedback.db")
+    store = feedback_store.FeedbackStore(path, flush_interval=0.05, max_attempts=2, retry_delay=0)
+    store.submit("Ada", "ada@example.com", "Great", 5)
+    # A rating of None fails in _write with a TypeError, not a sqlite3.Error
+    store._queue.put((time.time(), "Bob", "bob@example.com", "Broken", None))
+    assert store.flush(timeout=5)
+
+    assert [row[2] for row in rows(path, "feedback")] == ["Ada"]
+    failed = rows(path, "feedback_failed")
+    assert len(failed) == 1 and "TypeError" in failed[0][2]
+
+    store.submit("Cy", "cy@example.com", "Still writing", 4)
+    assert store.flush(timeout=5)
+    assert store._writer.is_alive()
+    assert store.rating_histogram() == {4: 1, 5: 1}
+
+
+def test_persistent_database_error_is_not_retried_forever(tmp_path):
+    path = str(tmp_path / "feedback.db")
+    store = feedback_store.FeedbackStore(path, flush_interval=0.05, max_attempts=3, retry_delay=0)
+    with contextlib.closing(sqlite3.connect(path)) as connection:
+        connection.execute("DROP TABLE feedback")
+    store.submit("Ada", "ada@example.com", "Lost table", 5)
+
+    assert store.flush(timeout=5)
+    assert "no such table" in rows(path, "feedback_failed")[0][2]
+    assert store._writer.is_alive()
@@ -0,0 +1,37 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_loader
+import downsample
+import trendline
+
+
+@pytest.fixture
+def data(monkeypatch):
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 10, 1000).astype(np.float32)
+    frame = pd.DataFrame({
+        "u": x,
+        "g": 2 * x + 1,
+        "class": pd.Categorical(rng.choice(["GALAXY", "QSO", "STAR"], 1000))
+    })
+    monkeypatch.setattr(data_loader, "load_data", lambda *args, **kwargs: frame)
+    for function in (downsample.sample_points, trendline.fit_line):
+        function.clear()
+    return frame
+
+
+def test_fit_line(data):
+    slope, intercept, r_squared = trendline.fit_line("u", "g")
+    assert slope == pytest.approx(2, rel=1e-5)
+    assert intercept == pytest.approx(1, rel=1e-4)
+    assert r_squared == pytest.approx(1)
+
+
+def test_categorical_column_draws_scatter_only(data):
+    assert all(math.isnan(value) for value in trendline.fit_line("class", "u"))
+    figure = trendline.trendline_figure("class", "u", "Regression")
+    assert len(figure.data) == 1
@@ -0,0 +1,61 @@
+"""Downscaled image variants cached on disk.
+
+Each variant is keyed by the source path, mtime, size and target dimension,
+so editing or replacing an image produces a new variant on its next access.
+"""
+import hashlib
+import os
+import tempfile
+
+from PIL import Image, ImageOps, features
+
+THUMBNAIL_DIR = os.path.join(".cache", "thumbnails")
+
+# Longest edge in pixels of each variant
+GRID_SIZE = 320
+SIDEBAR_SIZE = 600
+DISPLAY_SIZE = 1600
+
+# WebP is smaller at the same quality; fall back to JPEG if Pillow lacks it
+FORMAT, EXTENSION = ("WEBP", ".webp") if features.check("webp") else ("JPEG", ".jpg")
+QUALITY = 80
+
+
+def _variant_path(path, max_size, cache_dir):
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{max_size}|{FORMAT}|{QUALITY}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{digest}{EXTENSION}")
+
+
+def _render(path, target, max_size):
+    with Image.open(path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.thumbnail((max_size, max_size), Image.LANCZOS)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix=EXTENSION)
+        os.close(fd)
+        try:
+            image.save(tmp_path, FORMAT, quality=QUALITY)
+            os.replace(tmp_path, target)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+
+def thumbnail_path(path, max_size=GRID_SIZE, cache_dir=THUMBNAIL_DIR):
+    """Return the path of a variant of ``path`` no larger than ``max_size`` pixels.
+
+    The variant is rendered on first access and reused afterwards. If the
+    image cannot be read or the cache cannot be written, the original path is
+    returned so callers can still display something.
+    """
+    try:
+        target = _variant_path(path, max_size, cache_dir)
+        if not os.path.exists(target):
+            _render(path, target, max_size)
+        return target
+    except (OSError, ValueError):
+        return path
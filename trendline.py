@@ -0,0 +1,66 @@
+"""Least-squares trendlines drawn over a downsampled point cloud.
+
+Replaces ``px.scatter(..., trendline="ols")``, which imports statsmodels and
+fits and ships every row on each rerun.
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+import data_loader
+import downsample
+import stats
+
+
+@st.cache_data(show_spinner=False)
+def fit_line(x_column, y_column):
+    """Closed-form ordinary least squares of ``y_column`` on ``x_column``.
+
+    Returns (slope, intercept, r_squared) over rows where both values are
+    finite; slope and r_squared are NaN when x is constant, and all three
+    are NaN when either column is not numeric (such as "class").
+    """
+    data = data_loader.load_data()
+    if not (pd.api.types.is_numeric_dtype(data[x_column]) and pd.api.types.is_numeric_dtype(data[y_column])):
+        return float("nan"), float("nan"), float("nan")
+    x = data[x_column].to_numpy(dtype=np.float64)
+    y = data[y_column].to_numpy(dtype=np.float64)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if len(x) < 2:
+        return float("nan"), float("nan"), float("nan")
+    dx = x - x.mean()
+    dy = y - y.mean()
+    sxx = dx @ dx
+    if sxx == 0:
+        return float("nan"), float(y.mean()), float("nan")
+    slope = (dx @ dy) / sxx
+    intercept = y.mean() - slope * x.mean()
+    syy = dy @ dy
+    r_squared = (dx @ dy) ** 2 / (sxx * syy) if syy > 0 else 1.0
+    return float(slope), float(intercept), float(r_squared)
+
+
+def trendline_figure(x_column, y_column, title, budget=downsample.SCATTER_BUDGET):
+    """Scatter of a class-stratified sample of the rows with the full-data OLS line.
+
+    Without a fit (non-numeric or constant columns) only the scatter is drawn.
+    """
+    points = downsample.sample_points([x_column, y_column], budget)
+    slope, intercept, r_squared = fit_line(x_column, y_column)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(x=points[x_column], y=points[y_column], mode="markers", name="data",
+                               marker={"size": 4, "opacity": 0.6}))
+    if np.isfinite(slope):
+        low, high = stats.column_range(x_column)
+        fig.add_trace(go.Scatter(
+            x=[low, high],
+            y=[intercept + slope * low, intercept + slope * high],
+            mode="lines",
+            name=f"OLS: y = {slope:.4g}x + {intercept:.4g} (R² = {r_squared:.3f})",
+            line={"color": "#d62728", "width": 2}
+        ))
+    fig.update_layout(title=title, xaxis_title=x_column, yaxis_title=y_column)
+    return fig
@@ -1,23 +1,19 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-import seaborn as sns
-import matplotlib.pyplot as plt
+
+import data_loader
+import density
+import downsample
+import instrumentation
+import stats
+import trendline
 
 def main():
     st.title("📊 Visualize")
     st.write("Explore various visualizations of star data to gain insights.")
 
-    # Load dataset
-    @st.cache_data
-    def load_data():
-        try:
-            return pd.read_csv("star_classification.csv")
-        except Exception as e:
-            st.error(f"Error loading data: {e}")
-            return pd.DataFrame()  # Return empty DataFrame in case of error
-
-    data = load_data()
+    # Load dataset (shared across pages and sessions, see data_loader)
+    data = data_loader.load_data()
 
     if data.empty:
         st.stop()
@@ -28,44 +24,48 @@ def main():
     st.subheader("🖼️ Interactive Histogram")
     st.write("Select a column to visualize its distribution.")
     column = st.selectbox("Choose column for histogram:", data.columns.tolist())
+    histogram_class = st.selectbox("Filter histogram by class:", stats.class_options(), key="histogram_class")
     if column:
-        histogram_fig = px.histogram(data, x=column, nbins=20, title=f"Histogram of {column}")
-        st.plotly_chart(histogram_fig)
+        with instrumentation.section("chart: histogram"):
+            histogram_fig = stats.histogram_figure(column, nbins=20, class_value=histogram_class)
+            instrumentation.plotly_chart(histogram_fig)
 
     # Box Plot of Selected Column
     st.subheader("📊 Box Plot of Selected Column")
     st.write("Select a column to show the distribution.")
     column_box = st.selectbox("Choose column for box plot:", data.columns.tolist())
     if column_box:
-        box_plot = px.box(data, y=column_box, title=f"Box Plot of {column_box}")
-        st.plotly_chart(box_plot)
+        with instrumentation.section("chart: box plot"):
+            box_plot = px.box(data, y=column_box, title=f"Box Plot of {column_box}")
+            instrumentation.plotly_chart(box_plot)
 
     # Violin Plot of Selected Column
     st.subheader("🎻 Violin Plot of Selected Column")
     st.write("Select a column to visualize its distribution using a violin plot.")
-    column_violin = st.selectbox("Choose column for violin plot:", data.columns.tolist())
+    column_violin = st.selectbox("Choose column for violin plot:", data.select_dtypes("number").columns.tolist())
     if column_violin:
-        violin_plot = sns.violinplot(data[column_violin])
-        st.pyplot(violin_plot.figure)
-        plt.close()  # Close the figure to avoid display issues
+        with instrumentation.section("chart: violin plot"):
+            instrumentation.plotly_chart(density.violin_figure(column_violin))
 
     # Correlation Heatmap
     st.subheader("🌡️ Feature Correlation Heatmap")
     st.write("Select columns to show correlations.")
     columns_heatmap = st.multiselect("Choose columns for correlation heatmap:", data.columns.tolist(), default=["alpha", "delta", "u", "g", "r", "i", "z", "redshift"])
     if len(columns_heatmap) > 1:
-        correlation_matrix = data[columns_heatmap].corr()
-        heatmap_fig = px.imshow(correlation_matrix, text_auto=True, title="Feature Correlation Heatmap")
-        st.plotly_chart(heatmap_fig)
+        with instrumentation.section("chart: correlation heatmap"):
+            correlation_matrix = stats.correlation(columns_heatmap)
+            heatmap_fig = px.imshow(correlation_matrix, text_auto=True, title="Feature Correlation Heatmap")
+            instrumentation.plotly_chart(heatmap_fig)
     else:
         st.warning("Select at least two columns for correlation heatmap.")
 
     # Pie Chart of Star Types
     st.subheader("🥧 Star Type Distribution")
     st.write("Pie chart showing the distribution of star types.")
-    star_type_dist = data["class"].value_counts()
-    pie_chart_fig = px.pie(values=star_type_dist.values, names=star_type_dist.index, title="Star Type Distribution")
-    st.plotly_chart(pie_chart_fig)
+    with instrumentation.section("chart: star type distribution"):
+        star_type_dist = data["class"].value_counts()
+        pie_chart_fig = px.pie(values=star_type_dist.values, names=star_type_dist.index, title="Star Type Distribution")
+        instrumentation.plotly_chart(pie_chart_fig)
 
     # Line Chart of Average `alpha` by Star Type
  
@@ -81,8 +81,9 @@ def main():
     st.write("Select columns to visualize their trends over the index.")
     columns_line = st.multiselect("Choose columns for line plot:", data.columns.tolist(), default=["alpha", "delta"])
     if len(columns_line) > 0:
-        line_plot_fig = px.line(data, y=columns_line, title="Line Plot of Selected Columns")
-        st.plotly_chart(line_plot_fig)
+        with instrumentation.section("chart: line plot"):
+            line_plot_fig = px.line(downsample.line_points(columns_line), y=columns_line, title="Line Plot of Selected Columns")
+            instrumentation.plotly_chart(line_plot_fig)
 
     # Histogram of Selected Columns
 
@@ -92,8 +93,9 @@ def main():
     st.write("Select columns to show their distributions using box plots.")
     columns_box = st.multiselect("Choose columns for box plot:", data.columns.tolist(), default=["alpha", "delta"])
     if len(columns_box) > 0:
-        box_plot_fig = px.box(data, y=columns_box, title="Box Plot of Selected Columns")
-        st.plotly_chart(box_plot_fig)
+        with instrumentation.section("chart: multi-column box plot"):
+            box_plot_fig = px.box(data, y=columns_box, title="Box Plot of Selected Columns")
+            instrumentation.plotly_chart(box_plot_fig)
 
 
     # Bubble Chart
@@ -103,8 +105,9 @@ def main():
     y_bubble = st.selectbox("Choose Y-axis column for bubble chart:", data.columns.tolist(), key="y_bubble")
     size_bubble = st.selectbox("Choose column for bubble size:", data.columns.tolist(), key="size_bubble")
     if x_bubble and y_bubble and size_bubble:
-      bubble_chart_fig = px.scatter(data, x=x_bubble, y=y_bubble, size=size_bubble, title=f"Bubble Chart of {x_bubble} vs {y_bubble}")
-      st.plotly_chart(bubble_chart_fig)
+      with instrumentation.section("chart: bubble chart"):
+          bubble_chart_fig = px.scatter(downsample.sample_points([x_bubble, y_bubble, size_bubble]), x=x_bubble, y=y_bubble, size=size_bubble, title=f"Bubble Chart of {x_bubble} vs {y_bubble}")
+          instrumentation.plotly_chart(bubble_chart_fig)
 
 # Scatter Plot with Regression Line
     st.subheader("📉 Scatter Plot with Regression Line")
@@ -112,8 +115,9 @@ def main():
     x_column = st.selectbox("Choose X-axis column for scatter plot:", data.columns.tolist(), key="x_scatter")
     y_column = st.selectbox("Choose Y-axis column for scatter plot:", data.columns.tolist(), key="y_scatter")
     if x_column and y_column:
-       scatter_reg_fig = px.scatter(data, x=x_column, y=y_column, trendline="ols", title=f"Scatter Plot of {x_column} vs {y_column} with Regression Line")
-       st.plotly_chart(scatter_reg_fig)
+       with instrumentation.section("chart: regression scatter"):
+           scatter_reg_fig = trendline.trendline_figure(x_column, y_column, title=f"Scatter Plot of {x_column} vs {y_column} with Regression Line")
+           instrumentation.plotly_chart(scatter_reg_fig)
 
     # Heatmap of Selected Features
 